@@ -0,0 +1,254 @@
+# benchmarks/run_benchmarks.py
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.synthetic_data import generate_synthetic_dataset
+from src.treasury_forecasting.ingestion.ffiec_loader import (
+    load_ffiec_data,
+    extract_liquidity_fields,
+    extract_balance_fields,
+    save_cleaned_data
+)
+from src.treasury_forecasting import feature_engineering
+from src.treasury_forecasting import run_model_pipeline
+from src.treasury_forecasting.modeling import segmented_stress
+from src.treasury_forecasting.utils.instrumentation import peak_rss_mb
+
+RESULTS_PATH = PROJECT_ROOT / "benchmarks" / "results" / "benchmarks.jsonl"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+REGRESSION_TOLERANCE = 1.2
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+STAGES = ["ingestion", "feature_engineering", "rf_train", "rf_scenario", "segmentation"]
+BENCH_MODEL_PATH = "models/benchmark_rf.joblib"
+
+
+def _stage_paths(work_dir: str) -> tuple:
+    cleaned_dir = os.path.join(work_dir, "data", "cleaned")
+    return (cleaned_dir,
+            os.path.join(cleaned_dir, "ffiec_liquidity_panel.csv"),
+            os.path.join(cleaned_dir, "ffiec_balance_panel.csv"))
+
+
+def prepare_stage(stage: str, work_dir: str, paths: dict, train_rows: int):
+    """
+    Loads whatever a stage reads from earlier stages and returns the callable to time.
+    Stages hand data to each other only through files in work_dir, as the pipeline does.
+    """
+    cleaned_dir, liquidity_path, balance_path = _stage_paths(work_dir)
+
+    if stage == "ingestion":
+        def run():
+            liquidity, balance = [], []
+            for path_1, path_2 in paths["ffiec"]:
+                liquidity.append(extract_liquidity_fields(load_ffiec_data(path_1)))
+                balance.append(extract_balance_fields(load_ffiec_data(path_2, sep="\t")))
+            save_cleaned_data(pd.concat(liquidity, ignore_index=True), liquidity_path)
+            save_cleaned_data(pd.concat(balance, ignore_index=True), balance_path)
+        return run
+
+    if stage == "feature_engineering":
+        def run():
+            df = feature_engineering.load_and_merge_data(liquidity_path, balance_path, paths["macro"])
+            df = feature_engineering.engineer_features(df)
+            df.to_csv(os.path.join(cleaned_dir, "merged_features.csv"), index=False)
+            return len(df)
+        return run
+
+    if stage == "rf_train":
+        _, X, y = run_model_pipeline.load_data(run_model_pipeline.FEATURES)
+        sample = X.sample(n=min(train_rows, len(X)), random_state=42).index
+
+        def run():
+            model = run_model_pipeline.train_model(X.loc[sample], y.loc[sample])
+            run_model_pipeline.save_model(model, BENCH_MODEL_PATH)
+        return run
+
+    if stage == "rf_scenario":
+        df, X, _ = run_model_pipeline.load_data(run_model_pipeline.FEATURES)
+        model = run_model_pipeline.load_model(BENCH_MODEL_PATH)
+
+        def run():
+            shocked_X = run_model_pipeline.simulate_borrowing_shock(X, run_model_pipeline.SHOCK_PERCENT)
+            run_model_pipeline.flag_at_risk_banks(df, model.predict(shocked_X), run_model_pipeline.THRESHOLD)
+        return run
+
+    if stage == "segmentation":
+        def run():
+            df = segmented_stress.load_merged_data()
+            segmented_stress.summarize_risk_by_group(df)
+        return run
+
+    raise ValueError(f"Unknown benchmark stage '{stage}'")
+
+
+def measure_stage(stage: str, work_dir: str, paths: dict, train_rows: int) -> dict:
+    """
+    Runs one stage in the current process and returns its wall time, CPU time and peak RSS.
+    Meant to run in a fresh interpreter so ru_maxrss is this stage's own high-water mark.
+    """
+    os.chdir(work_dir)
+    os.makedirs("reports", exist_ok=True)
+    func = prepare_stage(stage, work_dir, paths, train_rows)
+
+    baseline_rss = peak_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    result = func()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    return {
+        "stage": stage,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": baseline_rss,
+        "rows_out": result if isinstance(result, int) else None
+    }
+
+
+def run_stages(work_dir: str, paths: dict, train_rows: int, verbose: bool = False) -> list:
+    """
+    Times each pipeline stage on the synthetic tree in work_dir, each in its own subprocess.
+    Timings are taken without tracemalloc, and the peak RSS includes native (numpy, sklearn) memory.
+    """
+    paths_file = os.path.join(work_dir, "benchmark_paths.json")
+    with open(paths_file, "w") as f:
+        json.dump(paths, f)
+
+    results = []
+    for stage in STAGES:
+        result_file = os.path.join(work_dir, f"benchmark_{stage}.json")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.run_benchmarks", "--stage", stage, "--work-dir", work_dir,
+             "--paths-file", paths_file, "--result-file", result_file, "--train-rows", str(train_rows)],
+            cwd=PROJECT_ROOT, check=True, stdout=None if verbose else subprocess.DEVNULL
+        )
+        with open(result_file) as f:
+            metrics = json.load(f)
+        print(f"  {stage:<20} wall {metrics['wall_s']:8.2f}s  cpu {metrics['cpu_s']:8.2f}s  "
+              f"peak RSS {metrics['peak_rss_mb']:9.1f} MB")
+        results.append(metrics)
+
+    rows = next(m["rows_out"] for m in results if m["stage"] == "feature_engineering")
+    for metrics in results:
+        metrics.pop("rows_out")
+        metrics["rows"] = rows
+    return results
+
+
+def record_results(results: list, path: Path = RESULTS_PATH) -> None:
+    """
+    Appends benchmark results as JSON lines so runs from different commits can be compared.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for row in results:
+            f.write(json.dumps(row) + "\n")
+    print(f"Benchmark results appended to {path}")
+
+
+def compare_to_previous(results: list, path: Path = RESULTS_PATH, tolerance: float = REGRESSION_TOLERANCE) -> list:
+    """
+    Compares wall time and peak memory against the latest recorded run from a different commit.
+    """
+    if not path.exists():
+        return []
+
+    history = pd.read_json(path, lines=True, dtype={"commit": str})
+    current = pd.DataFrame(results)
+    history = history[history["commit"] != current["commit"].iloc[0]]
+    if history.empty:
+        return []
+
+    baseline = history.sort_values("timestamp").groupby(["bank_quarters", "stage"]).last()
+    regressions = []
+    for row in results:
+        key = (row["bank_quarters"], row["stage"])
+        if key not in baseline.index:
+            continue
+        prior = baseline.loc[key]
+        for metric in ["wall_s", "peak_rss_mb"]:
+            if row[metric] is None or metric not in prior or not prior[metric] > 0:
+                continue
+            if row[metric] > tolerance * prior[metric]:
+                regressions.append(
+                    f"{row['stage']} @ {row['bank_quarters']:,}: {metric} "
+                    f"{prior[metric]} -> {row[metric]} (vs {prior['commit']})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic FFIEC/FRED data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Bank-quarters per run")
+    parser.add_argument("--quarters", type=int, default=8)
+    parser.add_argument("--train-rows", type=int, default=50_000,
+                        help="Cap on rows used to fit the Random Forest")
+    parser.add_argument("--no-record", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    parser.add_argument("--stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--paths-file", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child process for a single stage (see run_stages)
+    if args.stage:
+        with open(args.paths_file) as f:
+            paths = json.load(f)
+        metrics = measure_stage(args.stage, args.work_dir, paths, args.train_rows)
+        with open(args.result_file, "w") as f:
+            json.dump(metrics, f)
+        return
+
+    commit = _git_commit()
+    timestamp = datetime.now(timezone.utc).isoformat()
+    all_results = []
+
+    for size in args.sizes:
+        n_banks = max(size // args.quarters, 1)
+        print(f"\nBenchmark: {n_banks:,} banks x {args.quarters} quarters")
+        with tempfile.TemporaryDirectory(prefix="liquidity_bench_") as work_dir:
+            with contextlib.redirect_stdout(io.StringIO()):
+                paths = generate_synthetic_dataset(work_dir, n_banks, args.quarters)
+            results = run_stages(work_dir, paths, args.train_rows, args.verbose)
+
+        for row in results:
+            row.update({"commit": commit, "timestamp": timestamp, "bank_quarters": n_banks * args.quarters})
+        all_results.extend(results)
+
+    regressions = compare_to_previous(all_results)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+
+    if not args.no_record:
+        record_results(all_results)
+
+
+if __name__ == "__main__":
+    main()
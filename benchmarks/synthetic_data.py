@@ -0,0 +1,165 @@
+# benchmarks/synthetic_data.py
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Column codes the FFIEC extractors read (see ingestion/ffiec_loader.py)
+PART1_CODES = {
+    "RCON2200": "TOTAL DEPOSITS",
+    "RCON0081": "CASH AND BALANCES DUE FROM DEPOSITORY INSTITUTIONS: INTEREST-BEARING BALANCES",
+    "RCON0071": "CASH AND BALANCES DUE FROM DEPOSITORY INSTITUTIONS: NONINTEREST-BEARING BALANCES"
+}
+PART2_CODES = {
+    "RIAD0093": "TOTAL ASSETS",
+    "RIAD3196": "BORROWINGS"
+}
+
+# FRED series in the date,value layout written by macro_loader.fetch_and_save_fred_series
+MACRO_SERIES = {
+    "fed_funds_rate": (2.5, 1.5),
+    "cpi": (250.0, 30.0),
+    "ten_year_treasury": (3.0, 1.0)
+}
+
+
+def quarter_ends(n_quarters: int, last_quarter: str = "2023Q4") -> pd.DatetimeIndex:
+    """
+    Returns the last n quarter-end dates up to and including last_quarter.
+    """
+    periods = pd.period_range(end=last_quarter, periods=n_quarters, freq="Q")
+    return periods.to_timestamp(how="end").normalize()
+
+
+def _write_ffiec_tsv(df: pd.DataFrame, descriptions: dict, path: str) -> None:
+    """
+    Writes a tab-delimited FFIEC bulk file, including the description row under the header.
+    """
+    description_row = pd.DataFrame([{col: descriptions.get(col, "") for col in df.columns}])
+    pd.concat([description_row, df], ignore_index=True).to_csv(path, sep="\t", index=False)
+
+
+def generate_bank_panel(n_banks: int, n_quarters: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Simulates a balance sheet panel of n_banks x n_quarters with persistent bank-level size.
+    """
+    rng = np.random.default_rng(seed)
+    dates = quarter_ends(n_quarters)
+    certs = rng.choice(np.arange(1, 10 * n_banks + 1), size=n_banks, replace=False)
+
+    base_assets = rng.lognormal(mean=6.0, sigma=1.5, size=n_banks)
+    growth = rng.normal(0.005, 0.03, size=(n_quarters, n_banks)).cumsum(axis=0)
+    total_assets = base_assets * np.exp(growth)
+
+    deposits = total_assets * rng.uniform(0.6, 0.9, size=(n_quarters, n_banks)) * 100
+    cash_ratio = rng.beta(2, 18, size=(n_quarters, n_banks))
+    interest_share = rng.uniform(0.1, 0.7, size=(n_quarters, n_banks))
+    borrowings = total_assets * rng.normal(0.0, 0.5, size=(n_quarters, n_banks))
+
+    return pd.DataFrame({
+        "report_date": np.repeat(dates, n_banks),
+        "cert": np.tile(certs, n_quarters),
+        "institution": np.tile([f"SYNTHETIC BANK {c}" for c in certs], n_quarters),
+        "total_deposits": deposits.ravel().round(),
+        "interest_bearing_cash": (deposits * cash_ratio * interest_share).ravel().round(),
+        "noninterest_cash": (deposits * cash_ratio * (1 - interest_share)).ravel().round(),
+        "total_assets": total_assets.ravel().round(),
+        "borrowings": borrowings.ravel().round()
+    })
+
+
+def write_ffiec_files(panel: pd.DataFrame, ffiec_dir: str) -> list:
+    """
+    Writes one Part 1 / Part 2 pair of FFIEC TSVs per quarter and returns their paths.
+    """
+    os.makedirs(ffiec_dir, exist_ok=True)
+    paths = []
+    for report_date, quarter in panel.groupby("report_date", sort=True):
+        common = {
+            "IDRSSD": quarter["cert"].to_numpy() + 1_000_000,
+            "Reporting Period End Date": report_date.strftime("%m/%d/%Y"),
+            "FDIC Certificate Number": quarter["cert"].to_numpy()
+        }
+        part1 = pd.DataFrame({
+            **common,
+            "Financial Institution Name": quarter["institution"].to_numpy(),
+            "RCON2200": quarter["total_deposits"].to_numpy(),
+            "RCON0081": quarter["interest_bearing_cash"].to_numpy(),
+            "RCON0071": quarter["noninterest_cash"].to_numpy()
+        })
+        part2 = pd.DataFrame({
+            **common,
+            "RIAD0093": quarter["total_assets"].to_numpy(),
+            "RIAD3196": quarter["borrowings"].to_numpy()
+        })
+
+        stamp = report_date.strftime("%Y%m%d")
+        path_1 = os.path.join(ffiec_dir, f"FFIEC CDR Call Subset of Schedules {stamp}(1 of 2).txt")
+        path_2 = os.path.join(ffiec_dir, f"FFIEC CDR Call Subset of Schedules {stamp}(2 of 2).txt")
+        _write_ffiec_tsv(part1, PART1_CODES, path_1)
+        _write_ffiec_tsv(part2, PART2_CODES, path_2)
+        paths.append((path_1, path_2))
+    return paths
+
+
+def write_macro_files(dates: pd.DatetimeIndex, macro_dir: str, seed: int = 42) -> dict:
+    """
+    Writes monthly FRED-style date,value CSVs covering the panel's quarters.
+    """
+    os.makedirs(macro_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    months = pd.date_range(dates.min() - pd.DateOffset(months=12), dates.max(), freq="MS")
+
+    paths = {}
+    for name, (level, scale) in MACRO_SERIES.items():
+        values = level + rng.normal(0, scale / 10, size=len(months)).cumsum()
+        path = os.path.join(macro_dir, f"{name}.csv")
+        pd.DataFrame({"date": months.strftime("%Y-%m-%d"), "value": values.round(3)}).to_csv(path, index=False)
+        paths[name] = path
+    return paths
+
+
+def write_fdic_metadata(panel: pd.DataFrame, path: str, seed: int = 42) -> None:
+    """
+    Writes an FDIC BankFind-style metadata file (CERT, NAME, ID, ASSET) for the panel's banks.
+    """
+    rng = np.random.default_rng(seed)
+    latest = panel.sort_values("report_date").groupby("cert", sort=True).last().reset_index()
+    charters = np.array(["National Bank", "State Member Bank", "State Nonmember Bank", "Savings Association"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame({
+        "CERT": latest["cert"],
+        "NAME": charters[rng.integers(0, len(charters), size=len(latest))],
+        "ID": latest["cert"],
+        "ASSET": latest["total_assets"]
+    }).to_csv(path, index=False)
+
+
+def generate_synthetic_dataset(out_dir: str, n_banks: int, n_quarters: int, seed: int = 42) -> dict:
+    """
+    Writes a synthetic project tree under out_dir (data/ffiec, data/macro, data/cleaned/fdic_metadata.csv).
+    """
+    panel = generate_bank_panel(n_banks, n_quarters, seed)
+    ffiec_paths = write_ffiec_files(panel, os.path.join(out_dir, "data", "ffiec"))
+    macro_paths = write_macro_files(quarter_ends(n_quarters), os.path.join(out_dir, "data", "macro"), seed)
+    metadata_path = os.path.join(out_dir, "data", "cleaned", "fdic_metadata.csv")
+    write_fdic_metadata(panel, metadata_path, seed)
+
+    print(f"Synthetic dataset with {len(panel)} bank-quarters written to {out_dir}")
+    return {"ffiec": ffiec_paths, "macro": macro_paths, "fdic_metadata": metadata_path}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic FFIEC and FRED input files.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--banks", type=int, default=5000)
+    parser.add_argument("--quarters", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generate_synthetic_dataset(args.out_dir, args.banks, args.quarters, args.seed)
+
+
+if __name__ == "__main__":
+    main()
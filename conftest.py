@@ -0,0 +1 @@
+# Makes `src.treasury_forecasting` importable when pytest is run from the project root
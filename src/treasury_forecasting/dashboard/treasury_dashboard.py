@@ -1,8 +1,19 @@
+import sys
+from pathlib import Path
+
+import joblib
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Make the project root importable when launched with `streamlit run`
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.treasury_forecasting.run_model_pipeline import FEATURES, MODEL_PATH, SHOCK_PERCENT, load_data
+
 # File paths
 FLAGGED_DATA_PATH = "reports/flagged_risky_banks.csv"
 TOP_20_PLOT = "reports/top_risk_banks.png"
@@ -10,6 +21,10 @@ SHOCK_PLOT = "reports/borrowings_shock_impact.png"
 CHARTER_PLOT = "reports/charter_liquidity_boxplot.png"
 ASSET_TIER_PLOT = "reports/asset_tier_liquidity_boxplot.png"
 
+# Only the columns the bank table needs are read from the flagged CSV
+TABLE_COLUMNS = ["cert", "total_assets", "borrowings", "liquidity_post_shock"]
+PAGE_SIZE = 20
+
 # Set page config
 st.set_page_config(page_title="Treasury Liquidity Dashboard", layout="wide")
 
@@ -22,6 +37,18 @@ show_charter = st.sidebar.checkbox("Show Charter Boxplot", value=True)
 show_asset_tier = st.sidebar.checkbox("Show Asset Tier Boxplot", value=True)
 show_risky_table = st.sidebar.checkbox("Show Top Risky Banks Table", value=True)
 
+st.sidebar.header("Live Shock Controls")
+shocks = {
+    feature: st.sidebar.slider(
+        f"Shock to {feature} (%)",
+        min_value=-100,
+        max_value=300,
+        value=int(SHOCK_PERCENT * 100) if feature == "borrowings" else 0,
+        step=5
+    ) / 100
+    for feature in FEATURES
+}
+
 # Title and context
 st.title("Treasury Liquidity Stress Simulator")
 st.markdown("""
@@ -51,10 +78,89 @@ st.info(
     "highlighting stratified stress absorption capabilities."
 )
 
+@st.cache_resource
+def load_model():
+    """
+    Loads the persisted Random Forest once per server process.
+    """
+    model = joblib.load(PROJECT_ROOT / MODEL_PATH)
+    model.set_params(n_jobs=-1)
+    return model
+
+
+@st.cache_resource
+def load_feature_matrix():
+    """
+    Loads the cleaned feature matrix once and scores the unshocked baseline.
+    """
+    df, X, _ = load_data(FEATURES)
+    banks = df[["cert", "total_assets", "borrowings"]].reset_index(drop=True)
+    X = X.reset_index(drop=True)
+    baseline = load_model().predict(X)
+    return banks, X, baseline
+
+
+@st.cache_data(max_entries=64)
+def resimulate(shock_items):
+    """
+    Applies per-feature shocks to every bank and re-scores post-shock liquidity.
+    """
+    _, X, _ = load_feature_matrix()
+    factors = pd.Series({feature: 1 + shock for feature, shock in shock_items})
+    return load_model().predict(X.mul(factors[X.columns], axis=1))
+
+
+# Live re-simulation over the full bank universe
+st.subheader("Live Stress Re-simulation")
+try:
+    banks, X_live, baseline = load_feature_matrix()
+    live_post_shock = resimulate(tuple(sorted(shocks.items())))
+except FileNotFoundError as e:
+    st.warning(f"Live simulation unavailable, run the model pipeline first: {e}")
+else:
+    live_df = banks.assign(liquidity_post_shock=live_post_shock, liquidity_delta=live_post_shock - baseline)
+    live_risky = live_df[live_df["liquidity_post_shock"] < threshold]
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Banks Simulated", f"{len(live_df):,}")
+    m2.metric(f"Banks Below {threshold}%", f"{len(live_risky):,}")
+    m3.metric("Average Liquidity Change", f"{live_df['liquidity_delta'].mean():.4f}")
+
+    st.dataframe(
+        live_risky.sort_values("liquidity_post_shock").head(20),
+        use_container_width=True
+    )
+
+@st.cache_resource(max_entries=1)
+def load_flagged_table(mtime):
+    """
+    Reads the table columns of the flagged CSV once per file version, sorted by post-shock liquidity.
+    Shared by all sessions, so each rerun only slices it.
+    """
+    table = pd.read_csv(FLAGGED_DATA_PATH, usecols=TABLE_COLUMNS)
+    return table.sort_values("liquidity_post_shock", kind="stable").reset_index(drop=True)
+
+
+@st.cache_resource(max_entries=1)
+def load_flagged_export(mtime):
+    """
+    Returns the flagged CSV as-is for download, without re-serializing it.
+    Held as a shared resource so reruns don't copy the bytes.
+    """
+    with open(FLAGGED_DATA_PATH, "rb") as f:
+        return f.read()
+
+
+def count_below(table, threshold):
+    # Table is sorted, so banks below the threshold form a prefix
+    return int(table["liquidity_post_shock"].searchsorted(threshold, side="left"))
+
+
 # Load flagged data
 try:
-    df = pd.read_csv(FLAGGED_DATA_PATH)
-    risky_df = df[df["liquidity_post_shock"] < threshold]
+    flagged_mtime = Path(FLAGGED_DATA_PATH).stat().st_mtime
+    flagged_table = load_flagged_table(flagged_mtime)
+    num_risky = count_below(flagged_table, threshold)
 except Exception as e:
     st.error(f"Failed to load flagged data: {e}")
     st.stop()
@@ -80,20 +186,24 @@ with col2:
 # Show table of risky banks
 if show_risky_table:
     st.subheader(f"Top Risky Banks Below {threshold}% Liquidity")
-    preview = risky_df.sort_values("liquidity_post_shock").head(20)[
-        ["cert", "total_assets", "borrowings", "liquidity_post_shock"]
-    ]
+    num_pages = max((num_risky + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1)
+    start = (page - 1) * PAGE_SIZE
+    preview = flagged_table.iloc[start:min(start + PAGE_SIZE, num_risky)]
     st.dataframe(preview, use_container_width=True)
+    st.caption(f"Showing {len(preview)} of {num_risky:,} flagged banks • page {page} of {num_pages}")
 
-# Download button
+# Download button (export is only read once the user asks for it)
 st.subheader("Download Flagged Banks")
-csv = df.to_csv(index=False).encode("utf-8")
-st.download_button(
-    label="Download Full CSV",
-    data=csv,
-    file_name="flagged_risky_banks.csv",
-    mime="text/csv"
-)
+# st.button is only True on the rerun right after the click, so the bytes are sent once;
+# any later rerun (slider, checkbox, page, the download itself) drops the download button
+if st.button("Prepare Full CSV"):
+    st.download_button(
+        label="Download Full CSV",
+        data=load_flagged_export(flagged_mtime),
+        file_name="flagged_risky_banks.csv",
+        mime="text/csv"
+    )
 
 # Footer
 st.markdown("---")
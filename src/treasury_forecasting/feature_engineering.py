@@ -5,6 +5,9 @@ import pandas as pd
 import numpy as np
 import os
 
+from src.treasury_forecasting.metadata_index import load_metadata_index
+from src.treasury_forecasting.utils.instrumentation import instrumented
+
 # Define base directory (assumes script is run from project root)
 BASE_DIR = Path(__file__).resolve().parents[2]
 
@@ -23,16 +26,18 @@ BALANCE_PATH = BASE_DIR / "data" / "cleaned" / "ffiec_balance_panel.csv"
 
 
 
-def load_and_merge_data() -> pd.DataFrame:
+@instrumented("feature_load_merge")
+def load_and_merge_data(liquidity_path=LIQUIDITY_PATH, balance_path=BALANCE_PATH,
+                        macro_paths=MACRO_PATHS) -> pd.DataFrame:
     """
     Loads FFIEC liquidity, balance sheet, and macroeconomic indicators, merges them on date and cert.
     """
     # Load FFIEC liquidity panel
-    df_liquidity = pd.read_csv(LIQUIDITY_PATH, parse_dates=["report_date"])
+    df_liquidity = pd.read_csv(liquidity_path, parse_dates=["report_date"])
     print(f"Loaded liquidity data: {df_liquidity.shape}")
 
     # Load FFIEC balance sheet panel
-    df_balance = pd.read_csv(BALANCE_PATH, parse_dates=["report_date"])
+    df_balance = pd.read_csv(balance_path, parse_dates=["report_date"])
     print(f"Loaded balance sheet data: {df_balance.shape}")
 
     # Merge liquidity and balance sheet on report_date and cert
@@ -40,10 +45,10 @@ def load_and_merge_data() -> pd.DataFrame:
     print(f"Merged liquidity + balance: {df_merged.shape}")
 
     # Merge macro indicators
-    for name, path in MACRO_PATHS.items():
+    for name, path in macro_paths.items():
         df_macro = pd.read_csv(path, parse_dates=["date"])
         df_macro["report_date"] = df_macro["date"] + pd.offsets.MonthEnd(0)
-        df_macro = df_macro.drop(columns=["date"])
+        df_macro = df_macro.drop(columns=["date"]).rename(columns={"value": name})
         df_merged = pd.merge(df_merged, df_macro, on="report_date", how="left")
         print(f"Merged {name}: {df_macro.shape}")
 
@@ -53,6 +58,7 @@ def load_and_merge_data() -> pd.DataFrame:
 
 
 
+@instrumented("feature_engineering")
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Creates new features: ratios and lagged macro variables.
@@ -78,6 +84,7 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
 
 
 
+@instrumented("fdic_metadata_merge")
 def merge_fdic_metadata(df: pd.DataFrame) -> pd.DataFrame:
     """
     Optionally merges FDIC metadata using the 'cert' field.
@@ -86,15 +93,14 @@ def merge_fdic_metadata(df: pd.DataFrame) -> pd.DataFrame:
         print("FDIC metadata file not found. Skipping merge.")
         return df
 
-    df_fdic = pd.read_csv(FDIC_METADATA_PATH)
-    df_fdic = df_fdic.rename(columns={"CERT": "cert"})
-
-    # Merge on 'cert' field (must be present in FFIEC balance sheet data)
+    # Look up on 'cert' field (must be present in FFIEC balance sheet data)
     if "cert" not in df.columns:
         print("'cert' field not found in input data. Skipping FDIC merge.")
         return df
 
-    df_merged = pd.merge(df, df_fdic, on="cert", how="left")
+    index = load_metadata_index(FDIC_METADATA_PATH)
+    metadata_cols = [col for col in index.frame.columns if col not in ("cert", "effective_date")]
+    df_merged = index.attach(df, metadata_cols, date_col="report_date")
     print(f"FDIC metadata merged. New shape: {df_merged.shape}")
     return df_merged
 
@@ -113,7 +119,7 @@ def run_feature_engineering_pipeline() -> None:
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     # Save to CSV
-    df_features.to_csv(OUTPUT_PATH, index=False)
+    df_enriched.to_csv(OUTPUT_PATH, index=False)
     print(f"Final dataset saved to: {OUTPUT_PATH}")
 
 
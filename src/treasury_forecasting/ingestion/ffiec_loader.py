@@ -1,7 +1,10 @@
 import pandas as pd
 import os
 
+from src.treasury_forecasting.utils.instrumentation import instrumented
 
+
+@instrumented("ffiec_load")
 def load_ffiec_data(file_path: str, sep: str = "\t") -> pd.DataFrame:
     """
     Load the FFIEC raw data using the specified delimiter and return as a DataFrame.
@@ -23,6 +26,7 @@ def load_ffiec_data(file_path: str, sep: str = "\t") -> pd.DataFrame:
     return df
 
 
+@instrumented("ffiec_extract_liquidity")
 def extract_liquidity_fields(df: pd.DataFrame) -> pd.DataFrame:
     """
     Extracts liquidity-related fields from FFIEC Part 1.
@@ -47,6 +51,7 @@ def extract_liquidity_fields(df: pd.DataFrame) -> pd.DataFrame:
     return df_subset
 
 
+@instrumented("ffiec_extract_balance")
 def extract_balance_fields(df: pd.DataFrame) -> pd.DataFrame:
     """
     Extracts balance sheet fields from FFIEC Part 2.
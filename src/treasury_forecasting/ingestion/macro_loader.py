@@ -5,7 +5,10 @@ import pandas as pd
 import requests
 import os
 
+from src.treasury_forecasting.utils.instrumentation import instrumented
 
+
+@instrumented("fred_fetch")
 def fetch_fred_data(series_id: str, api_key: str, start_date: str = "2000-01-01") -> pd.DataFrame:
     """
     Fetches time series data from the FRED API and returns a DataFrame.
@@ -52,6 +55,7 @@ def fetch_and_save_fred_series(series_map: dict, api_key: str, output_dir: str)
             print(f"Saved {name} to {output_path}")
 
 
+@instrumented("fdic_metadata_fetch")
 def fetch_fdic_metadata(limit: int = 1000) -> pd.DataFrame:
     """
     Fetches basic bank metadata from the FDIC BankFind API.
@@ -0,0 +1,123 @@
+# src/treasury_forecasting/metadata_index.py
+
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Define base directory (assumes script is run from project root)
+BASE_DIR = Path(__file__).resolve().parents[2]
+FDIC_METADATA_PATH = BASE_DIR / "data" / "cleaned" / "fdic_metadata.csv"
+
+# Column holding the date from which a metadata row applies (FDIC's REPDTE when present)
+EFFECTIVE_DATE_COL = "effective_date"
+_EARLIEST_DAY = np.iinfo("int32").min
+
+
+def _to_days(dates, default: int) -> np.ndarray:
+    """
+    Converts dates to int64 day numbers, filling missing dates with a default.
+    """
+    days = pd.to_datetime(pd.Series(dates), errors="coerce").to_numpy(dtype="datetime64[D]")
+    out = days.astype("int64")
+    out[np.isnat(days)] = default
+    return out
+
+
+class MetadataIndex:
+    """
+    Cert-keyed bank metadata, sorted once for vectorized lookups by integer position.
+
+    A cert may have several rows, each effective from its own date, so attributes that change
+    over quarters (e.g. asset size) resolve to the row in force at a given report date.
+    """
+
+    def __init__(self, df: pd.DataFrame, date_col: str = EFFECTIVE_DATE_COL):
+        df = df.copy()
+        df["cert"] = pd.to_numeric(df["cert"], errors="coerce")
+        df = df.dropna(subset=["cert"])
+
+        if date_col in df.columns:
+            days = _to_days(df[date_col], _EARLIEST_DAY)
+        else:
+            days = np.full(len(df), _EARLIEST_DAY, dtype="int64")
+
+        certs = df["cert"].to_numpy(dtype="int64")
+        order = np.lexsort((days, certs))
+
+        self.frame = df.iloc[order].reset_index(drop=True)
+        self.certs = certs[order]
+        self.days = days[order]
+
+        # Composite (cert rank, day) key so one searchsorted resolves both cert and date
+        self._unique_certs, cert_rank = np.unique(self.certs, return_inverse=True)
+        self._keys = self._composite(cert_rank, self.days)
+
+    @staticmethod
+    def _composite(cert_rank: np.ndarray, days: np.ndarray) -> np.ndarray:
+        return (cert_rank.astype("int64") << 32) + (days - _EARLIEST_DAY)
+
+    def positions(self, certs, report_dates=None) -> np.ndarray:
+        """
+        Returns the row position in force for each cert (and report date), or -1 if none.
+        Without report dates the latest row for each cert is used.
+        """
+        query = pd.to_numeric(pd.Series(certs), errors="coerce").to_numpy(dtype="float64")
+        known = ~np.isnan(query)
+        query_certs = np.where(known, query, -1).astype("int64")
+
+        if report_dates is None:
+            query_days = np.full(len(query_certs), np.iinfo("int32").max, dtype="int64")
+        else:
+            query_days = _to_days(report_dates, np.iinfo("int32").max)
+
+        n_certs = len(self._unique_certs)
+        if n_certs == 0:
+            return np.full(len(query_certs), -1, dtype="int64")
+
+        rank = np.minimum(np.searchsorted(self._unique_certs, query_certs), n_certs - 1)
+        known &= self._unique_certs[rank] == query_certs
+
+        pos = np.searchsorted(self._keys, self._composite(rank, query_days), side="right") - 1
+        found = known & (pos >= 0)
+        found[found] = self.certs[pos[found]] == query_certs[found]
+        return np.where(found, pos, -1)
+
+    def lookup(self, certs, columns, report_dates=None) -> pd.DataFrame:
+        """
+        Returns the requested metadata columns aligned to the given certs (NaN where unknown).
+        """
+        pos = self.positions(certs, report_dates)
+        return self.frame[list(columns)].reindex(pos).reset_index(drop=True)
+
+    def attach(self, df: pd.DataFrame, columns, rename=None, date_col=None) -> pd.DataFrame:
+        """
+        Returns a copy of df with metadata columns added, looked up by its 'cert' column.
+        """
+        report_dates = df[date_col] if date_col else None
+        values = self.lookup(df["cert"], columns, report_dates)
+        if rename:
+            values = values.rename(columns=rename)
+
+        df = df.copy()
+        for col in values.columns:
+            df[col] = values[col].to_numpy()
+        return df
+
+
+@lru_cache(maxsize=None)
+def _load_metadata_index(path: str) -> MetadataIndex:
+    df = pd.read_csv(path)
+    df = df.rename(columns={"CERT": "cert", "REPDTE": EFFECTIVE_DATE_COL})
+    if EFFECTIVE_DATE_COL in df.columns:
+        df[EFFECTIVE_DATE_COL] = pd.to_datetime(df[EFFECTIVE_DATE_COL].astype(str), errors="coerce")
+    index = MetadataIndex(df)
+    print(f"Indexed FDIC metadata for {len(index._unique_certs)} certs")
+    return index
+
+
+def load_metadata_index(path=FDIC_METADATA_PATH) -> MetadataIndex:
+    """
+    Loads the FDIC metadata index once per process and reuses it on later calls.
+    """
+    return _load_metadata_index(str(Path(path).resolve()))
@@ -0,0 +1,194 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.treasury_forecasting.utils.instrumentation import instrumented
+
+RISKY_DATA_PATH = "reports/flagged_risky_banks.csv"
+OUTPUT_PATH = "reports/contagion_results.csv"
+THRESHOLD = 5.0
+N_LENDERS = 5
+MAX_ROUNDS = 100
+
+
+def _quarter_positions(report_dates, n: int) -> list:
+    """
+    Splits row positions by report date as (date, positions) pairs; all rows are one quarter without dates.
+    """
+    if report_dates is None:
+        return [(None, np.arange(n))]
+    dates = pd.to_datetime(pd.Series(np.asarray(report_dates)), errors="coerce")
+    codes, uniques = pd.factorize(dates, use_na_sentinel=False)
+    order = np.argsort(codes, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1)
+    return [(uniques[codes[positions[0]]], positions) for positions in groups if len(positions)]
+
+
+def synthesize_exposures(borrowings, total_assets, certs=None, report_dates=None,
+                         n_lenders: int = N_LENDERS, seed: int = 42) -> sparse.csr_matrix:
+    """
+    Spreads each bank's borrowings over n_lenders counterparties drawn in proportion to asset size.
+    Lenders are drawn from the same quarter only, so W is block diagonal by report date.
+    Returns W where W[i, j] is the funding row i receives from row j.
+    """
+    rng = np.random.default_rng(seed)
+    borrowings = np.nan_to_num(np.asarray(borrowings, dtype="float64")).clip(min=0)
+    assets = np.nan_to_num(np.asarray(total_assets, dtype="float64")).clip(min=0)
+    n = len(borrowings)
+    certs = np.arange(n) if certs is None else np.asarray(certs)
+
+    rows, cols, amounts = [], [], []
+    for _, positions in _quarter_positions(report_dates, n):
+        quarter_assets = assets[positions]
+        if len(positions) < 2 or quarter_assets.sum() == 0:
+            continue
+
+        borrowers = positions[borrowings[positions] > 0]
+        draws = rng.choice(len(positions), size=(len(borrowers), n_lenders), p=quarter_assets / quarter_assets.sum())
+        lenders = positions[draws]
+
+        # Split each borrower's funding across its lenders by lender size, dropping self-loans
+        weights = assets[lenders]
+        weights[(lenders == borrowers[:, None]) | (certs[lenders] == certs[borrowers][:, None])] = 0
+        row_totals = weights.sum(axis=1, keepdims=True)
+        quarter_amounts = np.divide(weights, row_totals, out=np.zeros_like(weights), where=row_totals > 0)
+        quarter_amounts *= borrowings[borrowers][:, None]
+
+        rows.append(np.repeat(borrowers, n_lenders))
+        cols.append(lenders.ravel())
+        amounts.append(quarter_amounts.ravel())
+
+    if not rows:
+        return sparse.csr_matrix((n, n))
+    W = sparse.coo_matrix(
+        (np.concatenate(amounts), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n)
+    ).tocsr()
+    W.eliminate_zeros()
+    return W
+
+
+def load_exposures(path: str, certs, report_dates=None) -> sparse.csr_matrix:
+    """
+    Builds W from an edge list CSV with borrower_cert, lender_cert and amount columns.
+    Edges link banks within the same quarter: an optional report_date column pins an edge to one
+    quarter, otherwise it applies in every quarter. Self-loans and certs outside the bank list are ignored.
+    """
+    edges = pd.read_csv(path)
+    certs = np.asarray(certs)
+    n = len(certs)
+    edge_dates = pd.to_datetime(edges["report_date"]) if "report_date" in edges else None
+    amounts = edges["amount"].to_numpy(dtype="float64")
+    external = (edges["borrower_cert"] != edges["lender_cert"]).to_numpy()
+
+    rows, cols, values = [], [], []
+    for date, positions in _quarter_positions(report_dates, n):
+        # A cert listed twice in one quarter maps to its first row
+        quarter_certs = pd.Index(certs[positions])
+        first = ~quarter_certs.duplicated()
+        index, positions = quarter_certs[first], positions[first]
+
+        borrower = index.get_indexer(edges["borrower_cert"])
+        lender = index.get_indexer(edges["lender_cert"])
+        keep = (borrower >= 0) & (lender >= 0) & external
+        if edge_dates is not None and date is not None:
+            keep &= (edge_dates == date).to_numpy()
+
+        rows.append(positions[borrower[keep]])
+        cols.append(positions[lender[keep]])
+        values.append(amounts[keep])
+
+    if not rows:
+        return sparse.csr_matrix((n, n))
+    W = sparse.coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n))
+    return W.tocsr()
+
+
+@instrumented("contagion")
+def propagate_contagion(W: sparse.csr_matrix, liquidity, total_deposits, threshold,
+                        runoff: float = 1.0, max_rounds: int = MAX_ROUNDS) -> dict:
+    """
+    Iterates funding withdrawals from breached banks until the set of breached banks stops changing.
+
+    liquidity is (n_banks,) or (n_banks, n_scenarios); threshold is a scalar or one per scenario.
+    A breached lender pulls `runoff` of its funding, which lowers each borrower's cash-to-deposit ratio
+    by the withdrawn amount over its deposits. Each round is one sparse matrix product for all scenarios.
+    With W block diagonal by report date, withdrawals only spread between banks in the same quarter.
+    """
+    liquidity = np.asarray(liquidity, dtype="float64")
+    single = liquidity.ndim == 1
+    if single:
+        liquidity = liquidity[:, None]
+    threshold = np.broadcast_to(np.asarray(threshold, dtype="float64"), (liquidity.shape[1],))
+
+    deposits = np.asarray(total_deposits, dtype="float64")
+    inv_deposits = np.divide(1.0, deposits, out=np.zeros_like(deposits), where=deposits > 0)[:, None]
+
+    breached = liquidity < threshold
+    breach_round = np.where(breached, 0, -1)
+    post = liquidity
+
+    rounds = 0
+    for rounds in range(1, max_rounds + 1):
+        withdrawn = runoff * (W @ breached.astype("float64"))
+        post = liquidity - withdrawn * inv_deposits
+        updated = breached | (post < threshold)
+        newly = updated & ~breached
+        if not newly.any():
+            break
+        breach_round[newly] = rounds
+        breached = updated
+
+    result = {
+        "liquidity_post_contagion": post,
+        "contagion_breach": breached,
+        "breach_round": breach_round,
+        "rounds": rounds
+    }
+    if single:
+        result.update({k: v[:, 0] for k, v in result.items() if k != "rounds"})
+
+    print(f"Contagion converged after {rounds} round(s): "
+          f"{int((breach_round > 0).sum())} second-round breaches")
+    return result
+
+
+def run_contagion(df: pd.DataFrame, threshold: float, exposures_path: str = None, runoff: float = 1.0) -> pd.DataFrame:
+    """
+    Adds second-round contagion results to a flagged bank frame from flag_at_risk_banks.
+    """
+    report_dates = df["report_date"] if "report_date" in df else None
+    if exposures_path:
+        W = load_exposures(exposures_path, df["cert"], report_dates)
+    else:
+        W = synthesize_exposures(df["borrowings"], df["total_assets"], df["cert"], report_dates)
+    print(f"Exposure network: {W.shape[0]} bank-quarters, {W.nnz} links")
+
+    result = propagate_contagion(W, df["liquidity_post_shock"], df["total_deposits"], threshold, runoff=runoff)
+
+    out = df[[col for col in ["report_date", "cert", "liquidity_post_shock", "risk_flag"] if col in df]].copy()
+    for col in ["liquidity_post_contagion", "contagion_breach", "breach_round"]:
+        out[col] = result[col]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propagate first-round breaches through the interbank network.")
+    parser.add_argument("--flagged", default=RISKY_DATA_PATH)
+    parser.add_argument("--exposures", default=None, help="Edge list CSV (borrower_cert, lender_cert, amount)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--runoff", type=float, default=1.0, help="Share of funding a breached lender withdraws")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.flagged)
+    out = run_contagion(df, args.threshold, args.exposures, args.runoff)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    out.to_csv(args.output, index=False)
+    print(f"Contagion results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
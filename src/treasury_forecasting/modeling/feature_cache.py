@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = "data/cleaned/merged_features.csv"
+CACHE_DIR = "data/cache/features"
+TARGET = "cash_to_deposit_ratio"
+CACHE_FORMAT = 3
+
+
+@dataclass
+class FeatureMatrix:
+    """
+    Cleaned float32 features and target, memory-mapped from the cache, plus the row index.
+    The cleaned source rows, in their original dtypes, are kept in frame_path for frames().
+    """
+    X: np.ndarray
+    y: np.ndarray
+    cert: np.ndarray
+    report_date: np.ndarray
+    features: list
+    target: str
+    version: str
+    frame_path: str
+
+    def frames(self):
+        """
+        Returns (df, X, y) matching the modeling loaders. X and y are float32 views over the cached arrays;
+        df is the cleaned source frame with every column at its original precision.
+        """
+        X = pd.DataFrame(self.X, columns=self.features, copy=False)
+        y = pd.Series(self.y, name=self.target, copy=False)
+        df = pd.read_parquet(self.frame_path)
+        return df, X, y
+
+
+def data_version(data_path: str, features, target: str) -> str:
+    """
+    Identifies one build of the matrix: the source file's path, size and mtime plus the column selection.
+    """
+    stat = os.stat(data_path)
+    key = f"{CACHE_FORMAT}|{os.path.abspath(data_path)}|{stat.st_size}|{stat.st_mtime_ns}|{','.join(features)}|{target}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def build_feature_cache(features, target: str = TARGET, data_path: str = DATA_PATH,
+                        cache_dir: str = CACHE_DIR) -> str:
+    """
+    Parses the merged features CSV once and writes the cleaned matrix as .npy files.
+    Rows with missing or infinite feature/target values are dropped.
+    The cleaned rows themselves, all columns at source precision, are stored alongside in frame.parquet.
+    """
+    version = data_version(data_path, features, target)
+    version_dir = os.path.join(cache_dir, version)
+    if os.path.exists(os.path.join(version_dir, "meta.json")):
+        return version_dir
+
+    df = pd.read_csv(data_path)
+    df = df.replace([np.inf, -np.inf], np.nan).dropna(subset=list(features) + [target])
+    df = df.reset_index(drop=True)
+
+    tmp_dir = f"{version_dir}.tmp{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    np.save(os.path.join(tmp_dir, "X.npy"), np.ascontiguousarray(df[list(features)].to_numpy(dtype="float32")))
+    np.save(os.path.join(tmp_dir, "y.npy"), df[target].to_numpy(dtype="float32"))
+    np.save(os.path.join(tmp_dir, "cert.npy"), df["cert"].fillna(-1).to_numpy(dtype="int64"))
+    np.save(os.path.join(tmp_dir, "report_date.npy"),
+            pd.to_datetime(df["report_date"], errors="coerce").to_numpy(dtype="datetime64[D]"))
+    df.to_parquet(os.path.join(tmp_dir, "frame.parquet"), index=False)
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump({"source": os.path.abspath(data_path), "features": list(features),
+                   "target": target, "rows": len(df), "version": version}, f, indent=2)
+
+    # Publish atomically; if another process got there first, keep its copy
+    try:
+        os.rename(tmp_dir, version_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"Feature cache built at {version_dir} with {len(df)} rows")
+    return version_dir
+
+
+def load_feature_matrix(features, target: str = TARGET, data_path: str = DATA_PATH,
+                        cache_dir: str = CACHE_DIR) -> FeatureMatrix:
+    """
+    Attaches to the cached matrix for this data version (building it first if needed).
+    Arrays are read-only memory maps, so processes share pages instead of re-parsing CSV.
+    """
+    version_dir = build_feature_cache(features, target, data_path, cache_dir)
+    with open(os.path.join(version_dir, "meta.json")) as f:
+        meta = json.load(f)
+
+    def attach(name):
+        return np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode="r")
+
+    return FeatureMatrix(
+        X=attach("X"),
+        y=attach("y"),
+        cert=attach("cert"),
+        report_date=attach("report_date"),
+        features=meta["features"],
+        target=meta["target"],
+        version=meta["version"],
+        frame_path=os.path.join(version_dir, "frame.parquet")
+    )
+
+
+def load_model_frames(features, target: str = TARGET, data_path: str = DATA_PATH):
+    """
+    Cached replacement for the per-module read_csv / replace / dropna loaders. Returns (df, X, y).
+    """
+    matrix = load_feature_matrix(features, target, data_path)
+    print(f"Loaded feature matrix {matrix.X.shape} (version {matrix.version})")
+    return matrix.frames()
@@ -0,0 +1,221 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.treasury_forecasting.run_model_pipeline import DATA_PATH, load_model, apply_shocks
+from src.treasury_forecasting.run_scenario_batch import MODELS_DIR, load_scenarios
+from src.treasury_forecasting.metadata_index import load_metadata_index
+from src.treasury_forecasting.modeling.feature_cache import load_feature_matrix
+from src.treasury_forecasting.modeling.segment_cube import (
+    asset_tier_categorical,
+    build_segment_cube,
+    update_segment_cube
+)
+from src.treasury_forecasting.utils.instrumentation import track_stage
+
+REPLAY_DIR = "reports/replay"
+SUMMARY_PATH = os.path.join(REPLAY_DIR, "breach_summary.parquet")
+BANK_RESULTS_DIR = os.path.join(REPLAY_DIR, "bank_results")
+FDIC_METADATA_PATH = "data/cleaned/fdic_metadata.csv"
+
+
+def split_quarters(report_date: np.ndarray) -> dict:
+    """
+    Maps each report date in the panel to the row positions of its banks.
+    """
+    order = np.argsort(report_date, kind="stable")
+    dates, starts = np.unique(report_date[order], return_index=True)
+    bounds = list(starts[1:]) + [len(order)]
+    return {
+        pd.Timestamp(date): order[start:end]
+        for date, start, end in zip(dates, starts, bounds)
+        if not np.isnat(date)
+    }
+
+
+def _fingerprint(scenario: dict, model_path: str, quarter_X: np.ndarray) -> str:
+    """
+    Identifies one (scenario, quarter) result by its scenario settings, model file and quarter data.
+    """
+    stat = os.stat(model_path)
+    digest = hashlib.sha1()
+    digest.update(json.dumps(
+        {k: scenario[k] for k in ["shocks", "threshold", "features", "model_id"]}, sort_keys=True
+    ).encode())
+    digest.update(f"{stat.st_size}|{stat.st_mtime_ns}".encode())
+    digest.update(np.ascontiguousarray(quarter_X).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _bank_results_path(scenario: str, report_date: pd.Timestamp) -> str:
+    return os.path.join(BANK_RESULTS_DIR, scenario, f"{report_date:%Y-%m-%d}.parquet")
+
+
+def load_replay_summary(scenario=None, columns=None) -> pd.DataFrame:
+    """
+    Reads the time-indexed breach summary, optionally for one or more scenarios.
+    """
+    if not os.path.exists(SUMMARY_PATH):
+        return pd.DataFrame()
+    filters = None
+    if scenario is not None:
+        filters = [("scenario", "in", [scenario] if isinstance(scenario, str) else list(scenario))]
+    return pd.read_parquet(SUMMARY_PATH, columns=columns, filters=filters)
+
+
+def breach_trend(scenario=None, metric: str = "banks_at_risk") -> pd.DataFrame:
+    """
+    Trend view (report_date x scenario) read straight from the stored summary.
+    """
+    summary = load_replay_summary(scenario, columns=["scenario", "report_date", metric])
+    if summary.empty:
+        return summary
+    return summary.pivot(index="report_date", columns="scenario", values=metric).sort_index()
+
+
+def load_replay_results(scenario: str, report_date) -> pd.DataFrame:
+    """
+    Reads bank-level post-shock liquidity and breach flags for one scenario and quarter.
+    """
+    return pd.read_parquet(_bank_results_path(scenario, pd.Timestamp(report_date)))
+
+
+def replay_quarter(report_date, rows, scenarios, matrix, models, model_paths, done: dict) -> list:
+    """
+    Scores every pending scenario for one quarter and writes its bank-level results.
+    """
+    features = matrix.features
+    quarter_X = pd.DataFrame(np.asarray(matrix.X[rows]), columns=features)
+    certs = np.asarray(matrix.cert[rows])
+
+    records = []
+    for scenario in scenarios:
+        quarter_features = quarter_X[scenario["features"]]
+        fingerprint = _fingerprint(scenario, model_paths[scenario["model_id"]], quarter_features.to_numpy())
+        if done.get((scenario["name"], report_date)) == fingerprint:
+            continue
+
+        with track_stage("replay_scoring", rows_in=quarter_features, scenario=scenario["name"],
+                         report_date=f"{report_date:%Y-%m-%d}") as stage:
+            post_shock = models[scenario["model_id"]].predict(apply_shocks(quarter_features, scenario["shocks"]))
+            stage["rows_out"] = post_shock
+        risk_flag = post_shock < scenario["threshold"]
+
+        path = _bank_results_path(scenario["name"], report_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pd.DataFrame({
+            "cert": certs,
+            "liquidity_post_shock": post_shock,
+            "risk_flag": risk_flag
+        }).to_parquet(path, index=False)
+
+        records.append({
+            "scenario": scenario["name"],
+            "report_date": report_date,
+            "model_id": scenario["model_id"],
+            "threshold": scenario["threshold"],
+            "banks": int(len(post_shock)),
+            "banks_at_risk": int(risk_flag.sum()),
+            "share_at_risk": float(risk_flag.mean()) if len(post_shock) else 0.0,
+            "mean_liquidity_post_shock": float(post_shock.mean()) if len(post_shock) else np.nan,
+            "min_liquidity_post_shock": float(post_shock.min()) if len(post_shock) else np.nan,
+            "fingerprint": fingerprint
+        })
+    return records
+
+
+def update_segments(records: list) -> None:
+    """
+    Refreshes the segment cube for every (scenario, quarter) slice that was just replayed,
+    rewriting the stored cube once.
+    """
+    index = load_metadata_index(FDIC_METADATA_PATH)
+    cells = []
+    for record in records:
+        results = load_replay_results(record["scenario"], record["report_date"])
+        results["report_date"] = record["report_date"]
+        metadata = index.lookup(results["cert"], ["NAME", "ASSET"], results["report_date"])
+        results["charter_class"] = metadata["NAME"].to_numpy()
+        results["asset_tier"] = asset_tier_categorical(metadata["ASSET"])
+        cells.append(build_segment_cube(results, record["scenario"]))
+
+    cells = [cube for cube in cells if not cube.empty]
+    if cells:
+        update_segment_cube(pd.concat(cells, ignore_index=True))
+
+
+def run_replay(config_path: str, workers: int = None, force: bool = False, update_cube: bool = False) -> pd.DataFrame:
+    """
+    Applies the scenario set to every quarter in the panel, in parallel over quarters.
+    Only (scenario, quarter) pairs that are new or whose inputs changed are recomputed.
+    """
+    scenarios = load_scenarios(config_path)
+    features = list(dict.fromkeys(f for s in scenarios for f in s["features"]))
+    matrix = load_feature_matrix(features, data_path=DATA_PATH)
+    quarters = split_quarters(np.asarray(matrix.report_date))
+    print(f"Replaying {len(scenarios)} scenarios over {len(quarters)} quarters")
+
+    model_paths = {s["model_id"]: os.path.join(MODELS_DIR, f"{s['model_id']}.joblib") for s in scenarios}
+    models = {model_id: load_model(path) for model_id, path in model_paths.items()}
+    for model in models.values():
+        model.set_params(n_jobs=1)
+
+    existing = load_replay_summary()
+    done = {}
+    if not existing.empty and not force:
+        done = {
+            (row.scenario, pd.Timestamp(row.report_date)): row.fingerprint
+            for row in existing.itertuples(index=False)
+        }
+
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(replay_quarter, date, rows, scenarios, matrix, models, model_paths, done)
+            for date, rows in quarters.items()
+        ]
+        records = [record for future in futures for record in future.result()]
+
+    if not records:
+        print("Replay store is up to date")
+        return existing
+
+    new = pd.DataFrame(records)
+    if not existing.empty:
+        replaced = pd.MultiIndex.from_frame(new[["scenario", "report_date"]])
+        keep = ~pd.MultiIndex.from_frame(existing[["scenario", "report_date"]]).isin(replaced)
+        new = pd.concat([existing[keep], new], ignore_index=True)
+    summary = new.sort_values(["scenario", "report_date"]).reset_index(drop=True)
+
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    summary.to_parquet(SUMMARY_PATH, index=False)
+    print(f"Replayed {len(records)} scenario-quarters; summary saved to {SUMMARY_PATH}")
+
+    if update_cube:
+        update_segments(records)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay stress scenarios across every quarter in the panel.")
+    parser.add_argument("config", nargs="?", help="JSON scenario file (same format as run_scenario_batch)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="Recompute every scenario-quarter")
+    parser.add_argument("--update-cube", action="store_true", help="Also refresh the segment cube")
+    parser.add_argument("--trend", nargs="*", default=None, metavar="SCENARIO",
+                        help="Print breaches over time from the stored summary")
+    args = parser.parse_args()
+
+    if args.config:
+        run_replay(args.config, workers=args.workers, force=args.force, update_cube=args.update_cube)
+    if args.trend is not None:
+        print(breach_trend(args.trend or None))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,17 @@
-import pandas as pd
 import statsmodels.api as sm
 import matplotlib.pyplot as plt
 
+from src.treasury_forecasting.modeling.feature_cache import load_model_frames
+from src.treasury_forecasting.utils.instrumentation import instrumented
+
 DATA_PATH = "data/cleaned/merged_features.csv"
 
+@instrumented("load_features")
 def preprocess_features():
     """
     Loads balance sheet-driven features for OLS regression.
     No scaling or log transform applied.
     """
-    df = pd.read_csv(DATA_PATH)
-    print(f"Loaded dataset with shape: {df.shape}")
-
     target = "cash_to_deposit_ratio"
     features = [
         "interest_bearing_cash",
@@ -21,17 +21,19 @@ def preprocess_features():
         "borrowings"
     ]
 
-    X_raw = df[features].copy()
-    y = df[target]
+    # Cached matrix already excludes rows with missing or infinite values
+    df, X_raw, y = load_model_frames(features, target, data_path=DATA_PATH)
+    print(f"Loaded dataset with shape: {df.shape}")
 
-    # Drop rows with missing or infinite values
-    X_raw = X_raw.replace([float("inf"), float("-inf")], pd.NA).dropna()
-    y = y.loc[X_raw.index]
+    # Cache is float32; OLS needs double precision on raw balance sheet magnitudes
+    X_raw = X_raw.astype("float64")
+    y = y.astype("float64")
 
     print("Selected internal liquidity features")
     return X_raw, y, features
 
 
+@instrumented("ols_train")
 def train_ols_model():
     """
     Trains an OLS model on liquidity-focused predictors.
@@ -0,0 +1,141 @@
+import os
+import numpy as np
+import pandas as pd
+
+CUBE_PATH = "reports/segment_cube.parquet"
+VALUE_COL = "liquidity_post_shock"
+
+# Asset tier bands (assuming assets are in millions), right-closed like pd.cut
+ASSET_TIER_BINS = [0, 250, 500, 1000, float("inf")]
+ASSET_TIER_LABELS = ["Under $250M", "$250M–$500M", "$500M–$1B", "Over $1B"]
+
+QUANTILES = [0.10, 0.25, 0.50, 0.75, 0.90]
+QUANTILE_COLS = [f"p{int(q * 100)}" for q in QUANTILES]
+CELL_KEYS = ["scenario", "report_date", "charter_class", "asset_tier"]
+CELL_STATS = ["count", "mean", "min"] + QUANTILE_COLS
+
+
+def asset_tier_codes(total_assets) -> np.ndarray:
+    """
+    Bins total assets into integer asset tier codes (-1 for missing or non-positive assets).
+    """
+    values = np.asarray(total_assets, dtype="float64")
+    codes = np.searchsorted(ASSET_TIER_BINS, values, side="left") - 1
+    codes[np.isnan(values) | (codes >= len(ASSET_TIER_LABELS))] = -1
+    return codes.astype("int8")
+
+
+def asset_tier_categorical(total_assets) -> pd.Categorical:
+    """
+    Returns asset tiers as a Categorical backed by the integer tier codes.
+    """
+    return pd.Categorical.from_codes(asset_tier_codes(total_assets), categories=ASSET_TIER_LABELS)
+
+
+def _segment_codes(df: pd.DataFrame):
+    """
+    Encodes report date, charter class and asset tier as integer codes.
+    """
+    date_codes, dates = pd.factorize(pd.to_datetime(df["report_date"]), use_na_sentinel=False)
+    charter_codes, charters = pd.factorize(df["charter_class"])
+
+    if isinstance(df["asset_tier"].dtype, pd.CategoricalDtype):
+        tier_codes = df["asset_tier"].cat.codes.to_numpy()
+    else:
+        tier_codes = pd.Categorical(df["asset_tier"], categories=ASSET_TIER_LABELS).codes
+
+    return (date_codes, dates), (charter_codes, charters), tier_codes
+
+
+def build_segment_cube(df: pd.DataFrame, scenario: str, value_col: str = VALUE_COL) -> pd.DataFrame:
+    """
+    Aggregates one scenario into charter class x asset tier x report date cells.
+    Rows without a charter class or asset tier are left out, as in a plain groupby.
+    """
+    (date_codes, dates), (charter_codes, charters), tier_codes = _segment_codes(df)
+    n_tiers = len(ASSET_TIER_LABELS)
+    n_charters = max(len(charters), 1)
+
+    valid = (charter_codes >= 0) & (tier_codes >= 0)
+    if not valid.any():
+        print(f"No rows with both charter class and asset tier for '{scenario}'; cube is empty")
+        return pd.DataFrame(columns=CELL_KEYS + CELL_STATS)
+
+    cell_key = (
+        date_codes[valid].astype("int64") * n_charters * n_tiers
+        + charter_codes[valid].astype("int64") * n_tiers
+        + tier_codes[valid].astype("int64")
+    )
+    values = pd.Series(df[value_col].to_numpy()[valid], index=cell_key)
+
+    grouped = values.groupby(level=0, sort=True)
+    cells = grouped.agg(["count", "mean", "min"])
+    quantiles = grouped.quantile(QUANTILES).unstack()
+    quantiles.columns = QUANTILE_COLS
+    cells = cells.join(quantiles)
+
+    keys = cells.index.to_numpy()
+    cube = pd.DataFrame({
+        "scenario": pd.Categorical([scenario] * len(cells)),
+        "report_date": dates[keys // (n_charters * n_tiers)],
+        "charter_class": pd.Categorical(charters[(keys // n_tiers) % n_charters]),
+        "asset_tier": pd.Categorical.from_codes(keys % n_tiers, categories=ASSET_TIER_LABELS),
+    })
+    for col in CELL_STATS:
+        cube[col] = cells[col].to_numpy()
+
+    print(f"Built segment cube for '{scenario}' with {len(cube)} cells")
+    return cube
+
+
+def load_segment_cube(path: str = CUBE_PATH, filters=None, columns=None) -> pd.DataFrame:
+    """
+    Reads pre-aggregated cells from the columnar cube store.
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=CELL_KEYS + CELL_STATS)
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def update_segment_cube(cells: pd.DataFrame, path: str = CUBE_PATH) -> pd.DataFrame:
+    """
+    Merges newly built cells into the stored cube.
+    Existing (scenario, report_date) slices covered by the new cells are replaced; all others are kept.
+    """
+    existing = load_segment_cube(path)
+    if cells.empty:
+        return existing
+
+    if not existing.empty:
+        new_slices = pd.MultiIndex.from_frame(cells[["scenario", "report_date"]].astype({"scenario": str}))
+        old_slices = pd.MultiIndex.from_frame(existing[["scenario", "report_date"]].astype({"scenario": str}))
+        existing = existing[~old_slices.isin(new_slices)]
+
+    cube = pd.concat([existing, cells], ignore_index=True)
+    for col in ["scenario", "charter_class"]:
+        cube[col] = cube[col].astype(str).astype("category")
+    cube["asset_tier"] = pd.Categorical(cube["asset_tier"].astype(str), categories=ASSET_TIER_LABELS)
+    cube = cube.sort_values(CELL_KEYS).reset_index(drop=True)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cube.to_parquet(path, index=False)
+    print(f"Segment cube saved to {path} ({len(cube)} cells)")
+    return cube
+
+
+def query_segment_cube(scenario=None, report_date=None, charter_class=None, asset_tier=None,
+                       columns=None, path: str = CUBE_PATH) -> pd.DataFrame:
+    """
+    Drill-down over pre-aggregated cells. Each argument accepts a single value or a list.
+    """
+    filters = []
+    for col, value in [("scenario", scenario), ("report_date", report_date),
+                       ("charter_class", charter_class), ("asset_tier", asset_tier)]:
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        if col == "report_date":
+            values = [pd.Timestamp(v) for v in values]
+        filters.append((col, "in", list(values)))
+
+    return load_segment_cube(path, filters=filters or None, columns=columns)
@@ -1,34 +1,34 @@
+import argparse
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from src.treasury_forecasting.metadata_index import load_metadata_index
+from src.treasury_forecasting.modeling.segment_cube import (
+    asset_tier_categorical,
+    build_segment_cube,
+    update_segment_cube,
+    query_segment_cube
+)
+from src.treasury_forecasting.reporting.render_reports import save_box_data, render_reports
+from src.treasury_forecasting.utils.instrumentation import instrumented
 
 RISKY_DATA_PATH = "reports/flagged_risky_banks.csv"
 FDIC_METADATA_PATH = "data/cleaned/fdic_metadata.csv" 
+SCENARIO_NAME = "borrowings_shock"
 
+@instrumented("segment_load")
 def load_merged_data():
-    # Load your FDIC metadata
-    fdic_df = pd.read_csv(FDIC_METADATA_PATH)
+    # Shared cert-keyed FDIC metadata index (loaded once per process)
+    index = load_metadata_index(FDIC_METADATA_PATH)
+
+    # Load risky bank list and look up its metadata
+    merged = pd.read_csv(RISKY_DATA_PATH)
+    report_dates = merged["report_date"] if "report_date" in merged.columns else None
+    metadata = index.lookup(merged["cert"], ["NAME", "ASSET"], report_dates)
 
-    # Rename columns for consistency
-    fdic_df = fdic_df.rename(columns={
-        "CERT": "cert",
-        "NAME": "charter_class",     # Using bank name as a placeholder
-        "ASSET": "total_assets"
-    })
+    merged["charter_class"] = metadata["NAME"].to_numpy()     # Using bank name as a placeholder
 
     # Create asset tier bands (assuming assets are in millions)
-    bins = [0, 250, 500, 1000, float("inf")]
-    labels = ["Under $250M", "$250M–$500M", "$500M–$1B", "Over $1B"]
-    fdic_df["asset_tier"] = pd.cut(fdic_df["total_assets"], bins=bins, labels=labels)
-
-    # Load risky bank list and merge
-    risky_df = pd.read_csv(RISKY_DATA_PATH)
-    merged = pd.merge(
-        risky_df,
-        fdic_df[["cert", "charter_class", "asset_tier"]],
-        on="cert",
-        how="left"
-    )
+    merged["asset_tier"] = asset_tier_categorical(metadata["ASSET"])
 
     print(f"Merged dataset with shape: {merged.shape}")
     return merged
@@ -36,52 +36,65 @@ def load_merged_data():
 def plot_by_charter_class(df):
     charter_order = df["charter_class"].value_counts().index.tolist()
 
-    plt.figure(figsize=(8, 5))
-    sns.boxplot(
-        x="charter_class",
-        y="liquidity_post_shock",
-        data=df,
-        order=charter_order,
-        palette="coolwarm"
+    spec_path = save_box_data(
+        df,
+        "charter_class",
+        "liquidity_post_shock",
+        charter_order,
+        "reports/charter_liquidity_boxplot.png",
+        title="Liquidity Distribution by Charter Type",
+        xlabel="Charter Type",
+        ylabel="Liquidity Ratio after Shock",
+        cmap="coolwarm"
     )
-    plt.title("Liquidity Distribution by Charter Type")
-    plt.ylabel("Liquidity Ratio after Shock")
-    plt.xlabel("Charter Type")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig("reports/charter_liquidity_boxplot.png")
-    print("Charter plot saved to reports/charter_liquidity_boxplot.png")
+    print(f"Charter plot data saved to {spec_path}")
+    return spec_path
 
 def plot_by_asset_tier(df):
     tier_order = df["asset_tier"].value_counts().index.tolist()
 
-    plt.figure(figsize=(8, 5))
-    sns.boxplot(
-        x="asset_tier",
-        y="liquidity_post_shock",
-        data=df,
-        order=tier_order,
-        palette="viridis"
+    spec_path = save_box_data(
+        df,
+        "asset_tier",
+        "liquidity_post_shock",
+        tier_order,
+        "reports/asset_tier_liquidity_boxplot.png",
+        title="Liquidity Distribution by Asset Tier",
+        xlabel="Asset Tier",
+        ylabel="Liquidity Ratio after Shock",
+        cmap="viridis"
+    )
+    print(f"Asset tier plot data saved to {spec_path}")
+    return spec_path
+
+@instrumented("segmentation")
+def summarize_risk_by_group(df, scenario=SCENARIO_NAME):
+    # Refresh this scenario's cells in the cube, then read the summary back from it
+    cells = build_segment_cube(df, scenario)
+    update_segment_cube(cells)
+
+    summary = query_segment_cube(
+        scenario=scenario,
+        columns=["report_date", "charter_class", "asset_tier", "count", "mean", "min"]
     )
-    plt.title("Liquidity Distribution by Asset Tier")
-    plt.ylabel("Liquidity Ratio after Shock")
-    plt.xlabel("Asset Tier")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig("reports/asset_tier_liquidity_boxplot.png")
-    print("Asset tier plot saved to reports/asset_tier_liquidity_boxplot.png")
-
-def summarize_risk_by_group(df):
-    grouped = df.groupby(["charter_class", "asset_tier"])
-    summary = grouped["liquidity_post_shock"].agg(["count", "mean", "min"]).reset_index()
     summary.to_csv("reports/segmented_liquidity_summary.csv", index=False)
     print("Segment summary saved to reports/segmented_liquidity_summary.csv")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Segment post-shock liquidity by charter class and asset tier.")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Only save results and plot data; render later with reporting.render_reports")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+
     df = load_merged_data()
-    plot_by_charter_class(df)
-    plot_by_asset_tier(df)
     summarize_risk_by_group(df)
+    spec_paths = [plot_by_charter_class(df), plot_by_asset_tier(df)]
+
+    if not args.no_plots:
+        render_reports(spec_paths=spec_paths)
 
 if __name__ == "__main__":
     main()
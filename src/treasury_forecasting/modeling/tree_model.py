@@ -1,19 +1,18 @@
-import pandas as pd
-import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from src.treasury_forecasting.modeling.feature_cache import load_model_frames
+from src.treasury_forecasting.utils.instrumentation import instrumented
+
 DATA_PATH = "data/cleaned/merged_features.csv"
 
+@instrumented("load_features")
 def load_and_prepare_data():
     """
     Load dataset and select liquidity-focused features.
     """
-    df = pd.read_csv(DATA_PATH)
-    print(f"Loaded dataset with shape: {df.shape}")
-
     features = [
         "interest_bearing_cash",
         "noninterest_cash",
@@ -23,13 +22,13 @@ def load_and_prepare_data():
     ]
     target = "cash_to_deposit_ratio"
 
-    df = df.replace([np.inf, -np.inf], np.nan).dropna()
-    X = df[features]
-    y = df[target]
+    df, X, y = load_model_frames(features, target, data_path=DATA_PATH)
+    print(f"Loaded dataset with shape: {df.shape}")
 
     return X, y, features
 
 
+@instrumented("tree_model_train")
 def train_random_forest_model():
     """
     Trains a Random Forest regression model.
@@ -1,19 +1,22 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_absolute_error
 
+from src.treasury_forecasting.modeling.feature_cache import load_model_frames
+from src.treasury_forecasting.reporting.render_reports import (
+    save_histogram_data,
+    save_bar_data,
+    render_reports
+)
+from src.treasury_forecasting.utils.instrumentation import instrumented, track_stage
+
 DATA_PATH = "data/cleaned/merged_features.csv"
 
+@instrumented("load_features")
 def load_data(features, target="cash_to_deposit_ratio"):
-    df = pd.read_csv(DATA_PATH)
-    df = df.replace([np.inf, -np.inf], np.nan).dropna()
-    X = df[features].copy()
-    y = df[target].copy()
-    return df, X, y
+    return load_model_frames(features, target, data_path=DATA_PATH)
 
+@instrumented("tree_scenarios_train")
 def train_model(X, y):
     model = RandomForestRegressor(n_estimators=100, random_state=42)
     model.fit(X, y)
@@ -32,32 +35,37 @@ def evaluate_model(y_true, y_pred):
     print(f"R² Score: {r2:.4f}")
     print(f"Mean Absolute Error: {mae:.4f}")
 
-    # Save residuals plot
+    # Save residuals plot data
     residuals = y_true - y_pred
-    plt.figure(figsize=(8, 5))
-    sns.histplot(residuals, bins=30, kde=True)
-    plt.title("Residuals Distribution (Predicted - Actual)")
-    plt.xlabel("Prediction Error")
-    plt.tight_layout()
-    plt.savefig("reports/residuals_plot.png")
-    print("Residuals plot saved to reports/residuals_plot.png")
+    spec_path = save_histogram_data(
+        residuals,
+        "reports/residuals_plot.png",
+        title="Residuals Distribution (Predicted - Actual)",
+        xlabel="Prediction Error",
+        bins=30
+    )
+    print(f"Residuals plot data saved to {spec_path}")
+    return spec_path
 
 def plot_simulation_results(y_orig, y_shocked):
     delta = y_shocked - y_orig
-    plt.figure(figsize=(8, 5))
-    sns.histplot(delta, bins=50, kde=True)
-    plt.title("Liquidity Change after Borrowing Shock")
-    plt.xlabel("Predicted Liquidity Ratio Δ")
-    plt.tight_layout()
-    plt.savefig("reports/borrowings_shock_impact.png")
-    print("Simulation plot saved to reports/borrowings_shock_impact.png")
+    spec_path = save_histogram_data(
+        delta,
+        "reports/borrowings_shock_impact.png",
+        title="Liquidity Change after Borrowing Shock",
+        xlabel="Predicted Liquidity Ratio Δ",
+        bins=50
+    )
+    print(f"Simulation plot data saved to {spec_path}")
 
     print("\nImpact Summary:")
     print(f"Number of banks with liquidity drop: {(delta < 0).sum()}")
     print(f"Average change in liquidity: {delta.mean():.2f}")
     print(f"Max liquidity drop: {delta.min():.2f}")
     print(f"Max liquidity gain: {delta.max():.2f}")
+    return spec_path
 
+@instrumented("flag_at_risk")
 def flag_at_risk_banks(df, y_shocked, threshold):
     df = df.copy()
     df["liquidity_post_shock"] = y_shocked
@@ -74,28 +82,35 @@ def flag_at_risk_banks(df, y_shocked, threshold):
 
     risky_df = df[df["risk_flag"]].sort_values("liquidity_post_shock").head(20)
 
-    # Plot top 20 riskiest banks
-    plt.figure(figsize=(10, 6))
-    sns.barplot(
-        x="liquidity_post_shock",
-        y="cert",
-        data=risky_df,
-        palette="Reds_r"
+    # Save top 20 riskiest banks chart data
+    spec_path = save_bar_data(
+        risky_df["liquidity_post_shock"],
+        risky_df["cert"].astype("int64"),
+        "reports/top_risk_banks.png",
+        title=f"Top 20 Banks Below {threshold}% Liquidity",
+        xlabel="Liquidity Ratio after Shock",
+        ylabel="Bank Cert Number"
     )
-    plt.title(f"Top 20 Banks Below {threshold}% Liquidity")
-    plt.xlabel("Liquidity Ratio after Shock")
-    plt.ylabel("Bank Cert Number")
-    plt.tight_layout()
-    plt.savefig("reports/top_risk_banks.png")
-    print("Riskiest banks chart saved to reports/top_risk_banks.png")
+    print(f"Riskiest banks chart data saved to {spec_path}")
 
     # Save full flagged list
     df.to_csv("reports/flagged_risky_banks.csv", index=False)
     print("Risky banks saved to reports/flagged_risky_banks.csv")
 
-    return df
+    return df, spec_path
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the borrowing shock scenario on the Random Forest model.")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Only save results and plot data; render later with reporting.render_reports")
+    parser.add_argument("--threshold", type=float, default=5.0, help="Liquidity threshold (%%)")
+    parser.add_argument("--shock", type=float, default=1.0,
+                        help="Borrowing shock as a fraction, e.g. 1.0 doubles borrowings")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     features = [
         "interest_bearing_cash",
         "noninterest_cash",
@@ -108,20 +123,20 @@ def main():
     model = train_model(X, y)
     y_pred_orig = model.predict(X)
 
-    evaluate_model(y, y_pred_orig)
+    spec_paths = [evaluate_model(y, y_pred_orig)]
 
-    shocked_X = simulate_borrowing_shock(X, shock_percent=1.0)
-    y_pred_shocked = model.predict(shocked_X)
+    with track_stage("scenario_scoring", rows_in=X) as stage:
+        shocked_X = simulate_borrowing_shock(X, shock_percent=args.shock)
+        y_pred_shocked = model.predict(shocked_X)
+        stage["rows_out"] = y_pred_shocked
 
-    plot_simulation_results(y_pred_orig, y_pred_shocked)
+    spec_paths.append(plot_simulation_results(y_pred_orig, y_pred_shocked))
 
-    try:
-        threshold = float(input("Enter liquidity threshold (%): "))
-    except ValueError:
-        threshold = 5.0
-        print("Invalid input. Defaulting to 5.0%.")
+    flagged_df, top_risk_spec = flag_at_risk_banks(df, y_pred_shocked, args.threshold)
+    spec_paths.append(top_risk_spec)
 
-    flagged_df = flag_at_risk_banks(df, y_pred_shocked, threshold)
+    if not args.no_plots:
+        render_reports(spec_paths=spec_paths)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,194 @@
+# src/treasury_forecasting/reporting/render_reports.py
+
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+REPORTS_DIR = "reports"
+PLOT_DATA_DIRNAME = "plot_data"
+
+
+def _spec_path(output: str) -> str:
+    """
+    Plot data for reports/x.png lives at reports/plot_data/x.json.
+    """
+    directory, filename = os.path.split(output)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, PLOT_DATA_DIRNAME, f"{stem}.json")
+
+
+def _write_spec(spec: dict) -> str:
+    path = _spec_path(spec["output"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(spec, f)
+    return path
+
+
+def save_histogram_data(values, output: str, title: str, xlabel: str, bins: int = 30) -> str:
+    """
+    Pre-bins values into histogram counts so the plot can be drawn later without the raw data.
+    """
+    values = np.asarray(values, dtype="float64")
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    return _write_spec({
+        "kind": "histogram",
+        "output": output,
+        "title": title,
+        "xlabel": xlabel,
+        "counts": counts.tolist(),
+        "edges": edges.tolist()
+    })
+
+
+def save_bar_data(values, labels, output: str, title: str, xlabel: str, ylabel: str, cmap: str = "Reds_r") -> str:
+    """
+    Saves horizontal bar values and their labels for later rendering.
+    """
+    return _write_spec({
+        "kind": "bar",
+        "output": output,
+        "title": title,
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "cmap": cmap,
+        "values": [float(v) for v in values],
+        "labels": [str(label) for label in labels]
+    })
+
+
+def save_box_data(df: pd.DataFrame, group_col: str, value_col: str, order, output: str,
+                  title: str, xlabel: str, ylabel: str, cmap: str = "coolwarm") -> str:
+    """
+    Pre-computes box statistics (quartiles and 1.5 IQR whiskers) per group for later rendering.
+    """
+    data = df[[group_col, value_col]].dropna()
+    grouped = data.groupby(group_col, observed=True)[value_col]
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    quartiles.columns = ["q1", "med", "q3"]
+
+    # Whiskers reach the most extreme values inside the 1.5 IQR fences
+    iqr = quartiles["q3"] - quartiles["q1"]
+    low_fence = data[group_col].map(quartiles["q1"] - 1.5 * iqr).astype("float64")
+    high_fence = data[group_col].map(quartiles["q3"] + 1.5 * iqr).astype("float64")
+    values = data[value_col]
+    whislo = values.where(values >= low_fence).groupby(data[group_col], observed=True).min()
+    whishi = values.where(values <= high_fence).groupby(data[group_col], observed=True).max()
+
+    stats = []
+    for label in order:
+        if label not in quartiles.index:
+            continue
+        stats.append({
+            "label": str(label),
+            "q1": float(quartiles.at[label, "q1"]),
+            "med": float(quartiles.at[label, "med"]),
+            "q3": float(quartiles.at[label, "q3"]),
+            "whislo": float(whislo.get(label, quartiles.at[label, "q1"])),
+            "whishi": float(whishi.get(label, quartiles.at[label, "q3"]))
+        })
+
+    return _write_spec({
+        "kind": "box",
+        "output": output,
+        "title": title,
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "cmap": cmap,
+        "stats": stats
+    })
+
+
+def render_spec(spec_path: str) -> str:
+    """
+    Draws one saved plot spec to its PNG.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    with open(spec_path) as f:
+        spec = json.load(f)
+
+    kind = spec["kind"]
+    if kind == "bar":
+        fig, ax = plt.subplots(figsize=(10, 6))
+    else:
+        fig, ax = plt.subplots(figsize=(8, 5))
+
+    if kind == "histogram":
+        edges = np.asarray(spec["edges"])
+        ax.bar(edges[:-1], spec["counts"], width=np.diff(edges), align="edge", edgecolor="white")
+        ax.set_ylabel("Count")
+    elif kind == "bar":
+        colors = plt.get_cmap(spec["cmap"])(np.linspace(0.1, 0.9, max(len(spec["values"]), 1)))
+        positions = np.arange(len(spec["values"]))
+        ax.barh(positions, spec["values"], color=colors)
+        ax.set_yticks(positions)
+        ax.set_yticklabels(spec["labels"])
+        ax.invert_yaxis()
+        ax.set_ylabel(spec["ylabel"])
+    elif kind == "box":
+        stats = spec["stats"]
+        boxes = ax.bxp(stats, showfliers=False, patch_artist=True)
+        colors = plt.get_cmap(spec["cmap"])(np.linspace(0, 1, max(len(stats), 1)))
+        for patch, color in zip(boxes["boxes"], colors):
+            patch.set_facecolor(color)
+        ax.set_ylabel(spec["ylabel"])
+        plt.setp(ax.get_xticklabels(), rotation=45)
+    else:
+        raise ValueError(f"Unknown plot kind '{kind}' in {spec_path}")
+
+    ax.set_title(spec["title"])
+    ax.set_xlabel(spec["xlabel"])
+    fig.tight_layout()
+
+    os.makedirs(os.path.dirname(spec["output"]) or ".", exist_ok=True)
+    fig.savefig(spec["output"])
+    plt.close(fig)
+    return spec["output"]
+
+
+def find_specs(report_dir: str = REPORTS_DIR) -> list:
+    """
+    Finds every saved plot spec under the report directory, including scenario subfolders.
+    """
+    pattern = os.path.join(report_dir, "**", PLOT_DATA_DIRNAME, "*.json")
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def render_reports(spec_paths=None, report_dir: str = REPORTS_DIR, max_workers=None) -> list:
+    """
+    Renders saved plot specs to PNGs in a pool of worker processes.
+    """
+    if spec_paths is None:
+        spec_paths = find_specs(report_dir)
+    if not spec_paths:
+        print(f"No plot data found under {report_dir}")
+        return []
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        outputs = list(pool.map(render_spec, spec_paths))
+
+    for output in outputs:
+        print(f"Rendered {output}")
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render report plots from saved pipeline results.")
+    parser.add_argument("--report-dir", default=REPORTS_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    render_reports(report_dir=args.report_dir, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
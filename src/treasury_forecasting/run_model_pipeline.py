@@ -1,34 +1,65 @@
 # run_model_pipeline.py
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import os
+import joblib
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_absolute_error
 
+from src.treasury_forecasting.modeling.feature_cache import load_model_frames
+from src.treasury_forecasting.reporting.render_reports import (
+    save_histogram_data,
+    save_bar_data,
+    render_reports
+)
+from src.treasury_forecasting.utils.instrumentation import instrumented, track_stage
+
 DATA_PATH = "data/cleaned/merged_features.csv"
+REPORTS_DIR = "reports"
 THRESHOLD = 5.0
 SHOCK_PERCENT = 1.0
-
+MODEL_PATH = "models/liquidity_rf.joblib"
+FEATURES = [
+    "interest_bearing_cash",
+    "noninterest_cash",
+    "total_deposits",
+    "total_assets",
+    "borrowings"
+]
+
+@instrumented("load_features")
 def load_data(features, target="cash_to_deposit_ratio"):
-    df = pd.read_csv(DATA_PATH)
-    df = df.replace([np.inf, -np.inf], np.nan).dropna()
-    X = df[features].copy()
-    y = df[target].copy()
-    return df, X, y
+    return load_model_frames(features, target, data_path=DATA_PATH)
 
+@instrumented("rf_train")
 def train_model(X, y):
     model = RandomForestRegressor(n_estimators=100, random_state=42)
     model.fit(X, y)
     return model
 
-def simulate_borrowing_shock(X, percent):
+def save_model(model, path=MODEL_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(model, path)
+    print(f"Model saved to {path}")
+
+def load_model(path=MODEL_PATH):
+    model = joblib.load(path)
+    print(f"Model loaded from {path}")
+    return model
+
+def apply_shocks(X, shocks):
+    """
+    Scales each shocked feature by (1 + shock), e.g. {"borrowings": 1.0} doubles borrowings.
+    """
     shocked_X = X.copy()
-    shocked_X["borrowings"] *= (1 + percent)
+    for feature, percent in shocks.items():
+        shocked_X[feature] *= (1 + percent)
     return shocked_X
 
-def evaluate_model(y_true, y_pred):
+def simulate_borrowing_shock(X, percent):
+    return apply_shocks(X, {"borrowings": percent})
+
+def evaluate_model(y_true, y_pred, output_dir=REPORTS_DIR):
     r2 = r2_score(y_true, y_pred)
     mae = mean_absolute_error(y_true, y_pred)
 
@@ -37,58 +68,76 @@ def evaluate_model(y_true, y_pred):
     print(f"Mean Absolute Error: {mae:.4f}")
 
     residuals = y_true - y_pred
-    plt.figure(figsize=(8, 5))
-    sns.histplot(residuals, bins=30, kde=True)
-    plt.title("Residuals Distribution (Predicted - Actual)")
-    plt.xlabel("Prediction Error")
-    plt.tight_layout()
-    plt.savefig("reports/residuals_plot.png")
-
-def plot_simulation_results(y_orig, y_shocked):
+    return save_histogram_data(
+        residuals,
+        os.path.join(output_dir, "residuals_plot.png"),
+        title="Residuals Distribution (Predicted - Actual)",
+        xlabel="Prediction Error",
+        bins=30
+    )
+
+def plot_simulation_results(y_orig, y_shocked, output_dir=REPORTS_DIR):
     delta = y_shocked - y_orig
-    plt.figure(figsize=(8, 5))
-    sns.histplot(delta, bins=50, kde=True)
-    plt.title("Liquidity Change after Borrowing Shock")
-    plt.xlabel("Predicted Liquidity Ratio Δ")
-    plt.tight_layout()
-    plt.savefig("reports/borrowings_shock_impact.png")
-
-def flag_at_risk_banks(df, y_shocked, threshold):
+    return save_histogram_data(
+        delta,
+        os.path.join(output_dir, "borrowings_shock_impact.png"),
+        title="Liquidity Change after Borrowing Shock",
+        xlabel="Predicted Liquidity Ratio Δ",
+        bins=50
+    )
+
+@instrumented("flag_at_risk")
+def flag_at_risk_banks(df, y_shocked, threshold, output_dir=REPORTS_DIR):
+    df = df.copy()
     df["liquidity_post_shock"] = y_shocked
     df["risk_flag"] = df["liquidity_post_shock"] < threshold
 
     risky_df = df[df["risk_flag"]].sort_values("liquidity_post_shock").head(20)
 
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x="liquidity_post_shock", y="cert", data=risky_df, palette="Reds_r")
-    plt.title(f"Top 20 Banks Below {threshold}% Liquidity")
-    plt.xlabel("Liquidity Ratio after Shock")
-    plt.ylabel("Bank Cert Number")
-    plt.tight_layout()
-    plt.savefig("reports/top_risk_banks.png")
-
-    df.to_csv("reports/flagged_risky_banks.csv", index=False)
-    print(f"✅ Pipeline completed. Flagged data saved to reports/flagged_risky_banks.csv")
+    spec_path = save_bar_data(
+        risky_df["liquidity_post_shock"],
+        risky_df["cert"].astype("int64"),
+        os.path.join(output_dir, "top_risk_banks.png"),
+        title=f"Top 20 Banks Below {threshold}% Liquidity",
+        xlabel="Liquidity Ratio after Shock",
+        ylabel="Bank Cert Number"
+    )
+
+    output_path = os.path.join(output_dir, "flagged_risky_banks.csv")
+    df.to_csv(output_path, index=False)
+    print(f"✅ Pipeline completed. Flagged data saved to {output_path}")
+
+    return df, spec_path
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the liquidity model and run the borrowing shock.")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Only save results and plot data; render later with reporting.render_reports")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Liquidity threshold (%%)")
+    parser.add_argument("--shock", type=float, default=SHOCK_PERCENT,
+                        help="Borrowing shock as a fraction, e.g. 1.0 doubles borrowings")
+    return parser.parse_args()
 
 def main():
-    features = [
-        "interest_bearing_cash",
-        "noninterest_cash",
-        "total_deposits",
-        "total_assets",
-        "borrowings"
-    ]
-
-    df, X, y = load_data(features)
+    args = parse_args()
+
+    df, X, y = load_data(FEATURES)
     model = train_model(X, y)
+    save_model(model)
     y_pred_orig = model.predict(X)
-    evaluate_model(y, y_pred_orig)
+    spec_paths = [evaluate_model(y, y_pred_orig)]
+
+    with track_stage("scenario_scoring", rows_in=X) as stage:
+        shocked_X = simulate_borrowing_shock(X, args.shock)
+        y_pred_shocked = model.predict(shocked_X)
+        stage["rows_out"] = y_pred_shocked
+    spec_paths.append(plot_simulation_results(y_pred_orig, y_pred_shocked))
 
-    shocked_X = simulate_borrowing_shock(X, SHOCK_PERCENT)
-    y_pred_shocked = model.predict(shocked_X)
-    plot_simulation_results(y_pred_orig, y_pred_shocked)
+    _, top_risk_spec = flag_at_risk_banks(df, y_pred_shocked, args.threshold)
+    spec_paths.append(top_risk_spec)
 
-    flag_at_risk_banks(df, y_pred_shocked, THRESHOLD)
+    if not args.no_plots:
+        render_reports(spec_paths=spec_paths)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,220 @@
+# run_scenario_batch.py
+
+import argparse
+import json
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.treasury_forecasting.run_model_pipeline import (
+    FEATURES,
+    REPORTS_DIR,
+    THRESHOLD,
+    load_data,
+    load_model,
+    apply_shocks,
+    plot_simulation_results,
+    flag_at_risk_banks
+)
+from src.treasury_forecasting.modeling.contagion import (
+    synthesize_exposures,
+    load_exposures,
+    propagate_contagion
+)
+from src.treasury_forecasting.reporting.render_reports import render_reports
+from src.treasury_forecasting.utils.instrumentation import track_stage
+
+MODELS_DIR = "models"
+DEFAULT_MODEL_ID = "liquidity_rf"
+SCENARIOS_DIR = os.path.join(REPORTS_DIR, "scenarios")
+
+# Example config:
+# {
+#   "model_id": "liquidity_rf",
+#   "threshold": 5.0,
+#   "scenarios": [
+#     {"name": "borrowings_x2", "shocks": {"borrowings": 1.0}},
+#     {"name": "deposit_run", "shocks": {"total_deposits": -0.3, "noninterest_cash": -0.5}, "threshold": 3.0}
+#   ]
+# }
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(name)).strip("._") or "scenario"
+
+
+def load_scenarios(config_path: str) -> list:
+    """
+    Reads a JSON scenario file and fills each scenario with the file-level defaults.
+    """
+    with open(config_path) as f:
+        config = json.load(f)
+
+    defaults = {
+        "model_id": config.get("model_id", DEFAULT_MODEL_ID),
+        "threshold": config.get("threshold", THRESHOLD),
+        "features": config.get("features", FEATURES)
+    }
+
+    scenarios, seen = [], set()
+    for i, entry in enumerate(config["scenarios"]):
+        scenario = {**defaults, **entry}
+        scenario["name"] = _safe_name(entry.get("name", f"scenario_{i}"))
+        scenario["shocks"] = {k: float(v) for k, v in entry.get("shocks", {}).items()}
+        scenario["threshold"] = float(scenario["threshold"])
+
+        if scenario["name"] in seen:
+            raise ValueError(f"Duplicate scenario name '{scenario['name']}' in {config_path}")
+        unknown = set(scenario["shocks"]) - set(scenario["features"])
+        if unknown:
+            raise ValueError(f"Scenario '{scenario['name']}' shocks unknown features: {sorted(unknown)}")
+
+        seen.add(scenario["name"])
+        scenarios.append(scenario)
+
+    print(f"Loaded {len(scenarios)} scenarios from {config_path}")
+    return scenarios
+
+
+def run_scenario(scenario: dict, df: pd.DataFrame, X: pd.DataFrame, model, baseline, output_dir: str):
+    """
+    Scores one scenario against the shared dataset and model, writing into its own folder.
+    Returns the scenario summary, its post-shock liquidity and the plot specs it wrote.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    X_scenario = X[scenario["features"]]
+
+    with track_stage("scenario_scoring", rows_in=X_scenario, scenario=scenario["name"]) as stage:
+        y_shocked = model.predict(apply_shocks(X_scenario, scenario["shocks"]))
+        stage["rows_out"] = y_shocked
+
+    impact_spec = plot_simulation_results(baseline, y_shocked, output_dir=output_dir)
+    flagged, top_risk_spec = flag_at_risk_banks(df, y_shocked, scenario["threshold"], output_dir=output_dir)
+
+    delta = y_shocked - baseline
+    summary = {
+        "scenario": scenario["name"],
+        "model_id": scenario["model_id"],
+        "threshold": scenario["threshold"],
+        "shocks": scenario["shocks"],
+        "banks": int(len(flagged)),
+        "banks_at_risk": int(flagged["risk_flag"].sum()),
+        "mean_liquidity_change": float(delta.mean()),
+        "max_liquidity_drop": float(delta.min())
+    }
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary, y_shocked, [impact_spec, top_risk_spec]
+
+
+def run_batch_contagion(scenarios, df: pd.DataFrame, post_shock: list, run_dir: str,
+                        exposures_path: str = None) -> pd.DataFrame:
+    """
+    Propagates every scenario's first-round breaches through one exposure network in a single pass.
+    Banks only lend to each other within the same report date.
+    """
+    if exposures_path:
+        W = load_exposures(exposures_path, df["cert"], df["report_date"])
+    else:
+        W = synthesize_exposures(df["borrowings"], df["total_assets"], df["cert"], df["report_date"])
+
+    thresholds = [scenario["threshold"] for scenario in scenarios]
+    result = propagate_contagion(W, np.column_stack(post_shock), df["total_deposits"], thresholds)
+
+    rows = []
+    for i, scenario in enumerate(scenarios):
+        out = pd.DataFrame({
+            "report_date": df["report_date"].to_numpy(),
+            "cert": df["cert"].to_numpy(),
+            "liquidity_post_shock": post_shock[i],
+            "liquidity_post_contagion": result["liquidity_post_contagion"][:, i],
+            "contagion_breach": result["contagion_breach"][:, i],
+            "breach_round": result["breach_round"][:, i]
+        })
+        out.to_csv(os.path.join(run_dir, scenario["name"], "contagion_results.csv"), index=False)
+        rows.append({
+            "scenario": scenario["name"],
+            "banks_breached_after_contagion": int(out["contagion_breach"].sum()),
+            "second_round_breaches": int((out["breach_round"] > 0).sum())
+        })
+    return pd.DataFrame(rows)
+
+
+def run_batch(config_path: str, run_name: str = None, workers: int = None, render: bool = False,
+              contagion: bool = False, exposures_path: str = None) -> pd.DataFrame:
+    """
+    Runs every scenario in the config in parallel over one loaded dataset and one copy of each model.
+    Outputs go to reports/scenarios/<run_name>/<scenario>/; an existing run folder is never reused.
+    """
+    scenarios = load_scenarios(config_path)
+    if not run_name:
+        stem = os.path.splitext(os.path.basename(config_path))[0]
+        run_name = f"{stem}_{datetime.now():%Y%m%dT%H%M%S}_{uuid.uuid4().hex[:8]}"
+    run_name = _safe_name(run_name)
+    run_dir = os.path.join(SCENARIOS_DIR, run_name)
+    os.makedirs(SCENARIOS_DIR, exist_ok=True)
+    try:
+        os.mkdir(run_dir)
+    except FileExistsError:
+        raise FileExistsError(f"Run folder {run_dir} already exists; pick another --run-name") from None
+
+    features = list(dict.fromkeys(f for s in scenarios for f in s["features"]))
+    df, X, _ = load_data(features)
+
+    models, baselines = {}, {}
+    for scenario in scenarios:
+        key = (scenario["model_id"], tuple(scenario["features"]))
+        if key in baselines:
+            continue
+        if scenario["model_id"] not in models:
+            models[scenario["model_id"]] = load_model(os.path.join(MODELS_DIR, f"{scenario['model_id']}.joblib"))
+        baselines[key] = models[scenario["model_id"]].predict(X[scenario["features"]])
+
+    # Parallelism comes from the scenario pool, so each prediction runs single-threaded
+    for model in models.values():
+        model.set_params(n_jobs=1)
+
+    def run_one(scenario):
+        key = (scenario["model_id"], tuple(scenario["features"]))
+        return run_scenario(scenario, df, X, models[scenario["model_id"]], baselines[key],
+                            os.path.join(run_dir, scenario["name"]))
+
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_one, scenarios))
+
+    summary = pd.DataFrame([summary for summary, _, _ in results])
+    if contagion:
+        post_shock = [y_shocked for _, y_shocked, _ in results]
+        contagion_summary = run_batch_contagion(scenarios, df, post_shock, run_dir, exposures_path)
+        summary = summary.merge(contagion_summary, on="scenario", how="left")
+
+    summary.to_csv(os.path.join(run_dir, "summary.csv"), index=False)
+    print(f"Batch '{run_name}' completed: {len(summary)} scenarios saved to {run_dir}")
+
+    if render:
+        render_reports(spec_paths=[path for _, _, specs in results for path in specs])
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a file of named stress scenarios non-interactively.")
+    parser.add_argument("config", help="JSON file with a 'scenarios' list")
+    parser.add_argument("--run-name", default=None, help="Output folder under reports/scenarios/")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--render", action="store_true", help="Render each scenario's plots after scoring")
+    parser.add_argument("--contagion", action="store_true", help="Add second-round interbank contagion")
+    parser.add_argument("--exposures", default=None, help="Edge list CSV (borrower_cert, lender_cert, amount)")
+    args = parser.parse_args()
+
+    run_batch(args.config, run_name=args.run_name, workers=args.workers, render=args.render,
+              contagion=args.contagion, exposures_path=args.exposures)
+
+
+if __name__ == "__main__":
+    main()
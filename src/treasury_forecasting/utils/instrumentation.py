@@ -0,0 +1,140 @@
+# src/treasury_forecasting/utils/instrumentation.py
+
+import cProfile
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RUN_LOG_DIR = os.environ.get("TREASURY_RUN_LOG_DIR", "reports/run_logs")
+RUN_ID = os.environ.get("TREASURY_RUN_ID") or f"{datetime.now():%Y%m%dT%H%M%S}_{os.getpid()}"
+
+# Comma-separated stage names to profile, or "all" (e.g. TREASURY_PROFILE=rf_train,scenario_scoring)
+PROFILE_STAGES = {s.strip() for s in os.environ.get("TREASURY_PROFILE", "").split(",") if s.strip()}
+
+_write_lock = threading.Lock()
+_profile_counter = itertools.count(1)
+
+
+def run_log_path() -> str:
+    return os.path.join(RUN_LOG_DIR, f"{RUN_ID}.jsonl")
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 2)
+
+
+def count_rows(obj):
+    """
+    Best-effort row count for frames, arrays and (X, y) style tuples; None when not applicable.
+    """
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    if hasattr(obj, "shape") and getattr(obj, "shape", ()):
+        return int(obj.shape[0])
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        return obj
+    return None
+
+
+def _write_record(record: dict) -> None:
+    path = run_log_path()
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+@contextmanager
+def track_stage(stage: str, rows_in=None, **fields):
+    """
+    Times a block and appends one JSON line with wall time, CPU time, peak RSS and row counts.
+    Set record["rows_out"] inside the block to report output rows.
+
+    cpu_s is process-wide, so it is left out for stages run from worker threads; thread_cpu_s
+    counts only the calling thread.
+    """
+    record = {"rows_out": None}
+    started_at = datetime.now(timezone.utc).isoformat()
+    rss_before = peak_rss_mb()
+    on_main_thread = threading.current_thread() is threading.main_thread()
+    wall_start, cpu_start, thread_cpu_start = time.perf_counter(), time.process_time(), time.thread_time()
+    status = "ok"
+    try:
+        yield record
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        rss_after = peak_rss_mb()
+        _write_record({
+            "run_id": RUN_ID,
+            "stage": stage,
+            "status": status,
+            "started_at": started_at,
+            "wall_s": round(time.perf_counter() - wall_start, 4),
+            "cpu_s": round(time.process_time() - cpu_start, 4) if on_main_thread else None,
+            "thread_cpu_s": round(time.thread_time() - thread_cpu_start, 4),
+            "peak_rss_mb": rss_after,
+            "peak_rss_growth_mb": None if rss_before is None else round(rss_after - rss_before, 2),
+            "rows_in": count_rows(rows_in),
+            "rows_out": count_rows(record["rows_out"]),
+            **fields
+        })
+
+
+def _profiling_enabled(stage: str) -> bool:
+    return "all" in PROFILE_STAGES or stage in PROFILE_STAGES
+
+
+def _run_profiled(stage: str, func, *args, **kwargs):
+    """
+    Runs func under cProfile and dumps stats next to the run log for snakeviz/pstats.
+    Each call gets its own numbered file so concurrent or repeated calls of a stage are all kept.
+    """
+    with _write_lock:
+        call = next(_profile_counter)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profile_dir = os.path.join(RUN_LOG_DIR, "profiles")
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(profile_dir, f"{RUN_ID}_{stage}_{call:04d}.prof"))
+
+
+def instrumented(stage: str = None):
+    """
+    Decorator that tracks a pipeline function as a stage. Rows in are counted from the first
+    argument and rows out from the return value. Set TREASURY_PROFILE to also profile it.
+    """
+    def decorator(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_stage(name, rows_in=args[0] if args else None) as record:
+                if _profiling_enabled(name):
+                    result = _run_profiled(name, func, *args, **kwargs)
+                else:
+                    result = func(*args, **kwargs)
+                record["rows_out"] = result
+            return result
+
+        return wrapper
+
+    return decorator
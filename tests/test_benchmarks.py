@@ -0,0 +1,11 @@
+from benchmarks.run_benchmarks import STAGES, run_stages
+from benchmarks.synthetic_data import generate_synthetic_dataset
+
+
+def test_benchmark_stages_complete_on_small_panel(tmp_path):
+    paths = generate_synthetic_dataset(str(tmp_path), n_banks=100, n_quarters=4)
+    results = run_stages(str(tmp_path), paths, train_rows=200)
+
+    assert [row["stage"] for row in results] == STAGES
+    assert all(row["rows"] > 0 for row in results)
+    assert all(row["wall_s"] >= 0 for row in results)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from src.treasury_forecasting.metadata_index import MetadataIndex
+
+
+def make_index():
+    return MetadataIndex(pd.DataFrame({
+        "cert": [20, 10, 10, 10, 30],
+        "effective_date": pd.to_datetime(["2023-06-30", "2023-07-01", "2023-01-01", "2023-04-01", None]),
+        "ASSET": [900.0, 300.0, 100.0, 200.0, 50.0]
+    }))
+
+
+def assets_at(index, certs, report_dates=None):
+    pos = index.positions(certs, report_dates)
+    return [index.frame.at[p, "ASSET"] if p >= 0 else None for p in pos]
+
+
+def test_dated_rows_resolve_to_row_in_force():
+    index = make_index()
+    dates = ["2023-01-01", "2023-03-31", "2023-06-30", "2023-12-31"]
+    assert assets_at(index, [10, 10, 10, 10], dates) == [100.0, 100.0, 200.0, 300.0]
+
+
+def test_query_before_first_effective_date_is_not_found():
+    index = make_index()
+    assert index.positions([10, 20], ["2022-12-31", "2023-03-31"]).tolist() == [-1, -1]
+
+
+def test_unknown_and_nan_certs_are_not_found():
+    index = make_index()
+    pos = index.positions([5, 15, 99, np.nan], ["2023-12-31"] * 4)
+    assert pos.tolist() == [-1, -1, -1, -1]
+
+
+def test_undated_row_applies_at_every_date():
+    index = make_index()
+    assert assets_at(index, [30, 30], ["1990-01-01", "2023-12-31"]) == [50.0, 50.0]
+
+
+def test_without_report_dates_latest_row_is_used():
+    index = make_index()
+    assert assets_at(index, [10, 20, 30]) == [300.0, 900.0, 50.0]
+
+
+def test_lookup_fills_missing_with_nan():
+    index = make_index()
+    values = index.lookup([10, 99], ["ASSET"], ["2023-04-15", "2023-04-15"])
+    assert values["ASSET"].iloc[0] == 200.0
+    assert np.isnan(values["ASSET"].iloc[1])